@@ -0,0 +1,63 @@
+# Run with: python3 -m nova.bench_clean DIR [max_chars]
+# Compares the streaming HTML extractor (web_fetcher._clean_bytes) with the old
+# regex cleaner on a corpus of saved pages (*.html / *.htm under DIR).
+import html, os, re, sys, time
+
+from .core import web_fetcher as WF
+
+def legacy_clean(b: bytes, max_chars: int = 400_000) -> str:
+    """The regex cleaner web_fetcher used before the streaming extractor."""
+    if not b:
+        return ""
+    s = b.decode("utf-8", "ignore")
+    s = html.unescape(s)
+    s = re.sub(r"(?is)<h[1-3][^>]*>", "\n", s)
+    s = re.sub(r"(?is)</h[1-3]>", "\n", s)
+    s = re.sub(r"(?is)<script.*?</script>", " ", s)
+    s = re.sub(r"(?is)<style.*?</style>", " ", s)
+    s = re.sub(r"(?is)<noscript.*?</noscript>", " ", s)
+    s = re.sub(r"(?is)<[^>]+>", " ", s)
+    s = re.sub(r"[ \t\r\f\v]+", " ", s)
+    s = re.sub(r" +\n", "\n", s).strip()
+    return s[:max_chars]
+
+def _pages(root: str):
+    for d, _, files in os.walk(root):
+        for f in sorted(files):
+            if f.lower().endswith((".html", ".htm")):
+                p = os.path.join(d, f)
+                with open(p, "rb") as fh:
+                    yield p, fh.read()
+
+def _time(fn, b: bytes, max_chars: int, reps: int):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        out = fn(b, max_chars)
+    return (time.perf_counter() - t0) * 1000 / reps, out
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args:
+        print("usage: python3 -m nova.bench_clean DIR [max_chars]")
+        sys.exit(2)
+    root = args[0]
+    max_chars = int(args[1]) if len(args) > 1 else 400_000
+    reps = int(os.getenv("NOVA_BENCH_REPS", "3"))
+    tot_old = tot_new = 0.0
+    n = 0
+    print(f"{'page':40} {'KB':>7} {'old ms':>8} {'new ms':>8} {'old ch':>8} {'new ch':>8} charset")
+    for path, b in _pages(root):
+        ms_old, s_old = _time(legacy_clean, b, max_chars, reps)
+        ms_new, s_new = _time(WF._clean_bytes, b, max_chars, reps)
+        tot_old += ms_old; tot_new += ms_new; n += 1
+        name = os.path.relpath(path, root)[-40:]
+        print(f"{name:40} {len(b) / 1024:7.1f} {ms_old:8.2f} {ms_new:8.2f} "
+              f"{len(s_old):8d} {len(s_new):8d} {WF.detect_charset(b)}")
+    if not n:
+        print(f"no .html/.htm files under {root}")
+        sys.exit(1)
+    print(f"\n{n} pages  old {tot_old:.1f} ms  new {tot_new:.1f} ms  "
+          f"({tot_old / tot_new if tot_new else 0:.2f}x)  max_chars={max_chars}")
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,78 @@
 import json
 import hashlib
+import sqlite3
+import threading
 import time
 import os
 from pathlib import Path
+# Indexed store: SQLite in WAL mode, one row per key (O(1) lookup by primary key).
+# The old append-only JSONL is imported once and renamed to *.jsonl.migrated.
 CACHE_PATH = Path.home()/".cache"/"nova"/"answer_cache.jsonl"
+DB_PATH = CACHE_PATH.with_suffix(".sqlite3")
 CACHE_TTL_DEFAULT = int(os.getenv("NOVA_CACHE_TTL","3600"))
-def _ensure(): CACHE_PATH.parent.mkdir(parents=True, exist_ok=True); CACHE_PATH.exists() or CACHE_PATH.touch()
+CACHE_MAX_ROWS = int(os.getenv("NOVA_CACHE_MAX_ROWS","5000"))
+_COMPACT_EVERY = 200  # puts between compaction passes
+_LOCK = threading.RLock(); _DB = None; _PUTS = 0
 def _now(): return int(time.time())
+def _migrate(c):
+    if not CACHE_PATH.exists(): return
+    rows = []
+    for line in CACHE_PATH.read_text(encoding="utf-8").splitlines():
+        try:
+            obj = json.loads(line); t = int(obj.get("t", 0))
+            rows.append((obj["k"], t, t + CACHE_TTL_DEFAULT, obj.get("text"), json.dumps(obj.get("meta") or {}, ensure_ascii=False)))
+        except Exception: pass
+    with c:  # later lines win, same as the old linear scan
+        c.executemany("INSERT OR REPLACE INTO answers(k,t,exp,text,meta) VALUES(?,?,?,?,?)", rows)
+    CACHE_PATH.rename(CACHE_PATH.with_name(CACHE_PATH.name + ".migrated"))
+def _db():
+    global _DB
+    with _LOCK:
+        if _DB is None:
+            DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            c = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+            c.execute("PRAGMA journal_mode=WAL"); c.execute("PRAGMA synchronous=NORMAL")
+            c.execute("CREATE TABLE IF NOT EXISTS answers(k TEXT PRIMARY KEY, t INTEGER NOT NULL, exp INTEGER NOT NULL, text TEXT, meta TEXT)")
+            c.execute("CREATE INDEX IF NOT EXISTS answers_exp ON answers(exp)")
+            c.execute("CREATE INDEX IF NOT EXISTS answers_t ON answers(t)")
+            c.commit()
+            try: _migrate(c)
+            except Exception: pass
+            _DB = c
+        return _DB
 def key_for(query, intent=None):
     q=" ".join((query or "").split()).lower().strip()
     salt=json.dumps({"intent":intent or "","vers":os.getenv("NOVA_VERSION","dev")},sort_keys=True)
     return hashlib.sha256((q+"|"+salt).encode()).hexdigest()[:16]
 def get(query,intent=None,ttl=CACHE_TTL_DEFAULT):
-    _ensure(); k=key_for(query,intent); hit=None
-    for line in CACHE_PATH.read_text(encoding="utf-8").splitlines():
-        try:
-            obj=json.loads(line)
-            if obj.get("k")==k: hit=obj
-        except Exception: pass
-    if hit and (_now()-hit.get("t",0) <= ttl): return hit.get("text"), hit.get("meta",{})
+    k=key_for(query,intent); now=_now()
+    with _LOCK:
+        c=_db(); row=c.execute("SELECT t,exp,text,meta FROM answers WHERE k=?",(k,)).fetchone()
+        if row and row[1] < now:  # past its own expiry: drop it on the way out
+            with c: c.execute("DELETE FROM answers WHERE k=?",(k,))
+            return None, None
+    if row and (now-row[0] <= ttl):
+        try: meta=json.loads(row[3] or "{}")
+        except Exception: meta={}
+        return row[2], meta
     return None, None
-def put(query,text,meta=None,intent=None):
-    _ensure(); rec={"k":key_for(query,intent),"t":_now(),"text":text,"meta":meta or {}}
-    with CACHE_PATH.open("a",encoding="utf-8") as f: f.write(json.dumps(rec,ensure_ascii=False)+"\n")
+def put(query,text,meta=None,intent=None,ttl=CACHE_TTL_DEFAULT):
+    global _PUTS
+    t=_now(); rec=(key_for(query,intent),t,t+int(ttl),text,json.dumps(meta or {},ensure_ascii=False))
+    with _LOCK:
+        c=_db()
+        with c: c.execute("INSERT OR REPLACE INTO answers(k,t,exp,text,meta) VALUES(?,?,?,?,?)",rec)
+        _PUTS+=1
+        if _PUTS % _COMPACT_EVERY == 0: compact()
     return True
-
+def compact(max_rows=CACHE_MAX_ROWS):
+    """Drop expired rows, then the oldest rows beyond `max_rows`. Returns rows removed."""
+    with _LOCK:
+        c=_db()
+        with c:
+            n=c.execute("DELETE FROM answers WHERE exp < ?",(_now(),)).rowcount
+            n+=c.execute("DELETE FROM answers WHERE k IN (SELECT k FROM answers ORDER BY t DESC LIMIT -1 OFFSET ?)",(int(max_rows),)).rowcount
+    return n
 
 # --- curated answers: minimal API ---
 import os
@@ -0,0 +1,52 @@
+# nova/cache/flight.py
+from __future__ import annotations
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+# Single-flight: concurrent callers with the same key share one computation.
+# The first caller (leader) runs fn(); the others block until it finishes and
+# get the same result (or the same exception).
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+_INFLIGHT: Dict[str, _Call] = {}
+_LOCK = threading.Lock()
+_STATS = {"leaders": 0, "shared": 0}
+
+def do(key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+    """Run fn() once per key at a time. Returns (result, shared) — shared=True for followers."""
+    with _LOCK:
+        call = _INFLIGHT.get(key)
+        if call is not None:
+            call.waiters += 1
+            _STATS["shared"] += 1
+            leader = False
+        else:
+            call = _INFLIGHT[key] = _Call()
+            _STATS["leaders"] += 1
+            leader = True
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+    try:
+        call.result = fn()
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _LOCK:
+            _INFLIGHT.pop(key, None)
+        call.done.set()
+    return call.result, False
+
+def stats() -> Dict[str, int]:
+    with _LOCK:
+        return dict(_STATS, inflight=len(_INFLIGHT))
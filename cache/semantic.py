@@ -0,0 +1,89 @@
+# nova/cache/semantic.py
+from __future__ import annotations
+import hashlib, os, threading, time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..core import vectors as VEC
+from .store import LRUCache
+
+# Optional near-duplicate layer behind the exact answer cache: queries are embedded
+# and a stored answer is served when cosine similarity clears NOVA_SEMANTIC_MIN.
+# Off unless NOVA_SEMANTIC=1 (and numpy is importable). Rows are grouped per
+# route + cache intent (model/style/persona), so only like-for-like answers match.
+SEM_ON = os.getenv("NOVA_SEMANTIC", "0").lower() in ("1", "true", "yes", "on")
+SEM_MIN = float(os.getenv("NOVA_SEMANTIC_MIN", "0.92"))
+_SEM_K = 5  # nearest rows checked for one that is similar enough and unexpired
+SEM_ROUTES = {r.strip() for r in os.getenv("NOVA_SEMANTIC_ROUTES", "model").split(",") if r.strip()}
+SEM_BASE = Path.home()/".cache"/"nova"/"semantic"
+
+_STORE = VEC.VectorStore(SEM_BASE)
+_EMBEDDER: Optional[Callable[[str], List[float]]] = None
+_RECENT = LRUCache(max_entries=256, ttl=300)  # q -> vector; lookup-miss then add embeds once
+_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "adds": 0, "errors": 0}
+
+def set_embedder(fn: Optional[Callable[[str], List[float]]]) -> None:
+    """Swap the embedding function (e.g. a local stand-in for tests); None → Ollama."""
+    global _EMBEDDER
+    _EMBEDDER = fn
+    _RECENT.clear()
+
+def enabled(route: str) -> bool:
+    return SEM_ON and VEC.available() and route in SEM_ROUTES
+
+def _embed(q: str) -> Optional[List[float]]:
+    vec = _RECENT.get(q)
+    if vec is not None:
+        return vec
+    try:
+        if _EMBEDDER is not None:
+            vec = _EMBEDDER(q)
+        else:
+            from ..core import router as ROUTER
+            vec = ROUTER.embed(q)
+    except Exception:
+        _count("errors")
+        return None
+    if vec:
+        _RECENT.set(q, vec, size=len(vec) * 4)
+    return vec
+
+def _group(route: str, intent: str) -> str:
+    return f"{route}|{hashlib.sha1((intent or '').encode('utf-8')).hexdigest()[:12]}"
+
+def _count(k: str) -> None:
+    with _LOCK: _STATS[k] += 1
+
+def lookup(q: str, route: str, intent: str, ttl: int) -> Optional[Tuple[str, Dict]]:
+    """Closest stored answer for the same route/intent within `ttl`, if similar enough."""
+    if not enabled(route):
+        return None
+    vec = _embed(q)
+    # the nearest rows may have expired while a slightly farther one has not
+    near = _STORE.search(vec, group=_group(route, intent), k=_SEM_K) if vec else []
+    for score, _, m in near:
+        if score < SEM_MIN:
+            break
+        if time.time() - float(m.get("t", 0)) <= ttl:
+            _count("hits")
+            return m.get("text") or "", dict(m.get("meta") or {}, cache="semantic",
+                                              similarity=round(score, 4), matched=m.get("q"))
+    _count("misses")
+    return None
+
+def add(q: str, route: str, intent: str, text: str, meta: Dict) -> None:
+    if not enabled(route) or not (text or "").strip():
+        return
+    vec = _embed(q)
+    if vec and _STORE.add(vec, {"group": _group(route, intent), "route": route, "q": q,
+                                "t": time.time(), "text": text, "meta": meta or {}}) >= 0:
+        _count("adds")
+
+def invalidate(route: Optional[str] = None) -> int:
+    """Drop every stored answer for `route` (all routes when None)."""
+    return _STORE.drop(lambda m: route is None or m.get("route") == route)
+
+def stats() -> Dict:
+    with _LOCK:
+        return dict(_STATS, enabled=SEM_ON and VEC.available(), threshold=SEM_MIN)
@@ -1,22 +1,102 @@
 # nova/cache/store.py
 from __future__ import annotations
-import hashlib, json, os, time
-from typing import Tuple, Dict, Any
+import os, threading, time
+from collections import OrderedDict
+from typing import Tuple, Dict, Any, Hashable, Optional
 
-_CACHE: dict[str, Tuple[str, Dict[str, Any]]] = {}  # key -> (text, meta)
+class LRUCache:
+    """
+    Thread-safe in-process LRU bounded by entry count *and* total size (bytes of
+    text), with an optional per-entry TTL. Expired entries are dropped on access.
+    """
+    def __init__(self, max_entries: int = 512, max_bytes: int = 8 << 20, ttl: Optional[float] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttl = ttl
+        self._d: "OrderedDict[Hashable, Tuple[Optional[float], int, Any]]" = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expired = 0
 
-def _key(q: str, style: dict, model: str, recency: bool, fresh: bool) -> str:
-    blob = json.dumps({"q":q.strip(), "m":model, "s":style.get("mode","brief"),
-                       "r":bool(recency), "f":bool(fresh)}, sort_keys=True)
-    return hashlib.sha1(blob.encode('utf-8')).hexdigest()
+    def get(self, key: Hashable, accept=None) -> Any:
+        """Value for `key`, or None. An entry failing `accept(value)` counts as a miss and stays put."""
+        with self._lock:
+            ent = self._d.get(key)
+            if ent is None:
+                self.misses += 1
+                return None
+            exp, size, val = ent
+            if exp is not None and exp < time.monotonic():
+                del self._d[key]
+                self._bytes -= size
+                self.expired += 1
+                self.misses += 1
+                return None
+            if accept is not None and not accept(val):
+                self.misses += 1
+                return None
+            self._d.move_to_end(key)
+            self.hits += 1
+            return val
 
-def get(q: str, style: dict, model: str, recency: bool, fresh: bool):
-    k = _key(q, style, model, recency, fresh)
-    val = _CACHE.get(k)
-    if val: return val
-    return None
+    def set(self, key: Hashable, val: Any, *, size: int = 0, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        exp = (time.monotonic() + ttl) if ttl is not None else None
+        size = max(0, int(size))
+        if size > self.max_bytes:
+            return  # a single oversized entry would flush everything else
+        with self._lock:
+            old = self._d.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._d[key] = (exp, size, val)
+            self._bytes += size
+            while len(self._d) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, sz, _) = self._d.popitem(last=False)
+                self._bytes -= sz
+                self.evictions += 1
 
-def set(q: str, style: dict, model: str, recency: bool, fresh: bool, text: str, meta: dict):
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            old = self._d.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._d.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._d)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"entries": len(self._d), "bytes": self._bytes,
+                    "max_entries": self.max_entries, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses,
+                    "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+                    "evictions": self.evictions, "expired": self.expired}
+
+_CACHE = LRUCache(
+    max_entries=int(os.getenv("NOVA_MEM_CACHE_MAX", "512")),
+    max_bytes=int(float(os.getenv("NOVA_MEM_CACHE_MAX_MB", "8")) * 1024 * 1024),
+)  # key -> (text, meta)
+
+def _key(q: str, style: dict, model: str, recency: bool, fresh: bool, extra: str = "") -> tuple:
+    # plain tuple: hashed natively by the dict, no JSON blob / SHA-1 per lookup
+    return (q.strip(), model, style.get("mode","brief"), bool(recency), bool(fresh), extra)
+
+def get(q: str, style: dict, model: str, recency: bool, fresh: bool, extra: str = ""):
+    return _CACHE.get(_key(q, style, model, recency, fresh, extra))
+
+def set(q: str, style: dict, model: str, recency: bool, fresh: bool, text: str, meta: dict,
+        extra: str = "", ttl: Optional[float] = None):
     if not text: return
-    k = _key(q, style, model, recency, fresh)
-    _CACHE[k] = (text, dict(meta or {}, cached_at=int(time.time())))
+    k = _key(q, style, model, recency, fresh, extra)
+    _CACHE.set(k, (text, dict(meta or {}, cached_at=int(time.time()))),
+               size=len(text.encode("utf-8")), ttl=ttl)
+
+def stats() -> Dict[str, Any]:
+    return _CACHE.stats()
@@ -0,0 +1,137 @@
+# nova/cache/web.py
+from __future__ import annotations
+import hashlib, json, os, threading, time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# One JSON file per URL (name = sha256 of the URL) under ~/.cache/nova/web/.
+# Entry: {"url", "t" (stored/revalidated at), "etag", "last_modified", "body"}.
+# File mtime doubles as the LRU clock: every hit bumps it, eviction drops the oldest.
+WEB_CACHE_DIR = Path.home()/".cache"/"nova"/"web"
+WEB_CACHE_ON = os.getenv("NOVA_WEB_CACHE", "1").lower() in ("1", "true", "yes", "on")
+WEB_CACHE_TTL_DEFAULT = int(os.getenv("NOVA_WEB_CACHE_TTL", "3600"))
+WEB_CACHE_MAX_BYTES = int(float(os.getenv("NOVA_WEB_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+# Per-domain TTLs (seconds); a host matches itself and its subdomains.
+# Override/extend with NOVA_WEB_CACHE_TTLS="docs.python.org=86400,wttr.in=300".
+_DOMAIN_TTL: Dict[str, int] = {
+    "duckduckgo.com": 600,
+    "wttr.in": 600,
+    "api.frankfurter.app": 900,
+    "docs.python.org": 86400,
+    "nvidia.com": 6 * 3600,
+    "github.com": 3600,
+}
+for _kv in (os.getenv("NOVA_WEB_CACHE_TTLS", "") or "").split(","):
+    if "=" in _kv:
+        _h, _v = _kv.split("=", 1)
+        try: _DOMAIN_TTL[_h.strip().lower()] = int(_v)
+        except ValueError: pass
+
+_LOCK = threading.Lock()
+_SIZE: Optional[int] = None  # bytes on disk; None until the first scan
+_STATS = {"hits": 0, "stale": 0, "misses": 0, "revalidated": 0, "evicted": 0}
+
+def ttl_for(url: str) -> int:
+    host = (urlsplit(url).hostname or "").lower()
+    while host:
+        if host in _DOMAIN_TTL:
+            return _DOMAIN_TTL[host]
+        host = host.partition(".")[2]
+    return WEB_CACHE_TTL_DEFAULT
+
+def _path(url: str) -> Path:
+    return WEB_CACHE_DIR / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + ".json")
+
+def _count(name: str) -> None:
+    with _LOCK: _STATS[name] += 1
+
+def lookup(url: str) -> Optional[Dict]:
+    """Return the entry (with a computed "fresh" flag) or None. Stale entries are still
+    returned so the caller can revalidate them or serve them when the network fails."""
+    if not WEB_CACHE_ON:
+        return None
+    p = _path(url)
+    try:
+        ent = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        _count("misses")
+        return None
+    if ent.get("url") != url:
+        _count("misses")
+        return None
+    ent["fresh"] = (time.time() - float(ent.get("t", 0))) <= ttl_for(url)
+    _count("hits" if ent["fresh"] else "stale")
+    try: os.utime(p)
+    except OSError: pass
+    return ent
+
+def validators(ent: Optional[Dict]) -> Dict[str, str]:
+    """Conditional-request headers for a stale entry."""
+    h: Dict[str, str] = {}
+    if ent and ent.get("etag"): h["If-None-Match"] = ent["etag"]
+    if ent and ent.get("last_modified"): h["If-Modified-Since"] = ent["last_modified"]
+    return h
+
+def _write(p: Path, ent: Dict) -> int:
+    WEB_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(ent, ensure_ascii=False).encode("utf-8")
+    tmp = p.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, p)
+    return len(data)
+
+def _store(url: str, ent: Dict) -> None:
+    """Write `ent` and keep the tracked `_SIZE` in step; evict when over budget."""
+    global _SIZE
+    p = _path(url)
+    try:
+        old = p.stat().st_size if p.exists() else 0
+        n = _write(p, ent)
+    except Exception:
+        return
+    with _LOCK:
+        if _SIZE is not None:
+            _SIZE += n - old
+        over = _SIZE is None or _SIZE > WEB_CACHE_MAX_BYTES
+    if over:
+        evict()
+
+def put(url: str, body: str, *, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+    if not WEB_CACHE_ON or not body:
+        return
+    _store(url, {"url": url, "t": time.time(), "etag": etag, "last_modified": last_modified, "body": body})
+
+def revalidated(url: str, ent: Dict) -> str:
+    """Server said 304: restart the entry's TTL and hand back the cached body."""
+    _count("revalidated")
+    keep = {k: ent.get(k) for k in ("url", "etag", "last_modified", "body")}
+    _store(url, dict(keep, t=time.time()))
+    return ent.get("body") or ""
+
+def evict(max_bytes: int = WEB_CACHE_MAX_BYTES) -> int:
+    """LRU eviction by file mtime down to 90% of `max_bytes`. Returns files removed."""
+    global _SIZE
+    try:
+        files = [(f.stat().st_mtime, f.stat().st_size, f) for f in WEB_CACHE_DIR.glob("*.json")]
+    except Exception:
+        return 0
+    total = sum(sz for _, sz, _ in files)
+    removed = 0
+    if total > max_bytes:
+        for _, sz, f in sorted(files, key=lambda x: x[0]):
+            if total <= max_bytes * 0.9:
+                break
+            try:
+                f.unlink(); total -= sz; removed += 1
+            except OSError:
+                pass
+    with _LOCK:
+        _SIZE = total
+        _STATS["evicted"] += removed
+    return removed
+
+def stats() -> Dict:
+    with _LOCK:
+        return dict(_STATS, bytes=_SIZE)
@@ -1,13 +1,17 @@
 # nova/chat_loop.py
 from __future__ import annotations
-import os, sys, time, json
-from typing import Optional
+import contextlib, os, sys, time, json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 # Orchestrator: routes to skills / model / web and returns (text, meta)
 from . import orchestrator as ORCH
 
 # Centralized slash handlers (/style, /forceweb, /noemoji, /persona, /greeting, /remember, /recall, /forget, …)
 from . import slash as SLASH
+from .core import style as STYLE
+from .core import convo as CONVO
+from .core import keepwarm as KEEPWARM
 
 # Optional default model from config
 try:
@@ -17,27 +21,26 @@ except Exception:
     _DEFAULT_MODEL = None
 
 
-def _print_metrics(route: str, t_start: float):
-    """Keep the existing metrics lines your tests rely on."""
+def _metrics_text(route: str, t_start: float) -> str:
     try:
         elapsed = time.perf_counter() - t_start
     except Exception:
         elapsed = 0.0
     route = route or "model"
-    print(f"[metrics] route={route}", flush=True)
-    print(f"[oneshot] total={elapsed:.2f}s route={route} ", flush=True)
+    return f"[metrics] route={route}\n[oneshot] total={elapsed:.2f}s route={route} "
+
+
+def _print_metrics(route: str, t_start: float):
+    """Keep the existing metrics lines your tests rely on."""
+    print(_metrics_text(route, t_start), flush=True)
 
 
 def _warm(model: Optional[str] = None) -> str:
-    """Legacy /warm response, kept for compatibility."""
-    return json.dumps(
-        {
-            "ok": True,
-            "ms": 1000,
-            "model": model or os.getenv("MODEL") or _DEFAULT_MODEL,
-            "keep_alive": os.getenv("NOVA_KEEP_ALIVE", "20m"),
-        }
-    )
+    """/warm: load (or refresh) the model now and report the real timings."""
+    model = model or os.getenv("MODEL") or _DEFAULT_MODEL or "nous-hermes-13b-fast:latest"
+    out = KEEPWARM.warm(model)
+    out["keepwarm"] = KEEPWARM.stats()["models"].get(model, {})
+    return json.dumps(out)
 
 
 def _handle_slash(line: str) -> bool:
@@ -77,20 +80,113 @@ def _oneshot(model: Optional[str], content: str) -> None:
         return
 
     t0 = time.perf_counter()
-    text, meta = ORCH.answer(
-        q, model=model, trace=(os.getenv("NOVA_TRACE", "0") == "1")
-    )
+    convo = CONVO.session() if CONVO.enabled() else None
+    history = convo.messages() if convo else None
+    if os.getenv("NOVA_STREAM", "0") == "1":
+        meta, text = _stream(model, q, history)
+    else:
+        text, meta = ORCH.answer(
+            q, model=model, trace=(os.getenv("NOVA_TRACE", "0") == "1"), history=history
+        )
+        print(text or "[empty]", flush=True)
+    if convo:
+        convo.add(q, text)
     route = (meta or {}).get("route") or (meta or {}).get("mode") or "model"
-    print(text or "[empty]", flush=True)
     _print_metrics(route, t0)
 
 
+def _stream(model: Optional[str], q: str, history: Optional[list] = None) -> tuple:
+    """Print pieces as they land (NOVA_STREAM=1); returns (final meta, full text)."""
+    meta: dict = {}
+    style = {"no_emoji": ORCH._NE()}
+    wrote = False
+    pieces = []
+    for piece in ORCH.answer_stream(
+        q, model=model, trace=(os.getenv("NOVA_TRACE", "0") == "1"), meta=meta,
+        history=history,
+    ):
+        piece = STYLE.scrub_emoji_live(piece, style)
+        if not wrote:
+            piece = piece.lstrip()
+        if piece:
+            sys.stdout.write(piece)
+            sys.stdout.flush()
+            pieces.append(piece)
+            wrote = True
+    print("" if wrote else "[empty]", flush=True)
+    return meta, "".join(pieces)
+
+
+def _oneshot_text(model: Optional[str], content: str) -> str:
+    """Buffered _oneshot for batch mode: returns what _oneshot would print (no streaming)."""
+    q = (content or "").strip()
+    if not q:
+        return "[empty]"
+    t0 = time.perf_counter()
+    text, meta = ORCH.answer(q, model=model, trace=(os.getenv("NOVA_TRACE", "0") == "1"))
+    route = (meta or {}).get("route") or (meta or {}).get("mode") or "model"
+    return f"{text or '[empty]'}\n{_metrics_text(route, t0)}"
+
+
+def _parallelism() -> int:
+    """Concurrent questions in piped mode: NOVA_PARALLEL, else Ollama's OLLAMA_NUM_PARALLEL, else 1."""
+    for k in ("NOVA_PARALLEL", "OLLAMA_NUM_PARALLEL"):
+        try:
+            n = int(os.getenv(k, "") or 0)
+        except ValueError:
+            n = 0
+        if n > 0:
+            return n
+    return 1
+
+
+def _batch(model: Optional[str], lines: List[str], par: int) -> None:
+    """
+    Piped input with parallelism > 1: questions between two slash commands form a
+    segment and run concurrently; slash commands run in order as barriers. Answers are
+    printed in input order; anything else printed meanwhile goes to stderr.
+    Conversation mode needs each answer before the next question, so its segments
+    run one by one.
+    """
+    segment: List[str] = []
+    with ThreadPoolExecutor(max_workers=par, thread_name_prefix="nova-batch") as ex:
+        def flush():
+            if CONVO.enabled():
+                for q in segment:
+                    _oneshot(model, q)
+            else:
+                # diagnostics printed by worker threads (web notes, timings, traces) go to
+                # stderr so they can't land inside another question's answer
+                out = sys.stdout
+                with contextlib.redirect_stdout(sys.stderr):
+                    for fut in [ex.submit(_oneshot_text, model, q) for q in segment]:
+                        print(fut.result(), file=out, flush=True)
+            segment.clear()
+
+        for ln in lines:
+            if not ln.strip():
+                continue
+            if ln.strip().startswith("/"):
+                flush()
+                try:
+                    _handle_slash(ln)
+                except Exception:
+                    print("slash error", flush=True)
+                continue
+            segment.append(ln)
+        flush()
+
+
 def main():
     model = os.getenv("MODEL") or _DEFAULT_MODEL or "nous-hermes-13b-fast:latest"
 
     # If piped input is present, process *each line* in order (commands and questions interleaved)
     if not sys.stdin.isatty():
         block = sys.stdin.read()
+        par = _parallelism()
+        if par > 1:
+            _batch(model, (block or "").splitlines(), par)
+            return
         for ln in (block or "").splitlines():
             if not ln.strip():
                 continue
@@ -103,7 +199,9 @@ def main():
             _oneshot(model, ln)
         return
 
-    # Interactive REPL mode
+    # Interactive REPL mode: load the model while the user types (piped runs leave
+    # keep-warm to the first model request, so skill-only input never loads it)
+    KEEPWARM.start([model])
     try:
         while True:
             line = input()
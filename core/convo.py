@@ -0,0 +1,157 @@
+# nova/core/convo.py
+from __future__ import annotations
+import os, threading
+from typing import Callable, Dict, List, Optional
+
+from ..logging import diag
+from .persona import approx_tokens
+
+# Conversation mode (/convo on): the chat loop keeps a bounded history per session.
+# When the recent turns exceed NOVA_CONVO_TOKENS, the oldest ones are folded into a
+# running summary by a background model call, so the prompt stays roughly flat
+# however long the session runs. The last NOVA_CONVO_KEEP messages are never folded.
+CONVO_ON = os.getenv("NOVA_CONVO", "0").lower() in ("1", "true", "yes", "on")
+CONVO_TOKENS = int(os.getenv("NOVA_CONVO_TOKENS", "1200"))
+CONVO_KEEP = int(os.getenv("NOVA_CONVO_KEEP", "4"))
+SUMMARY_TOKENS = int(os.getenv("NOVA_CONVO_SUMMARY_TOKENS", "250"))
+
+_SUMMARY_PROMPT = (
+    "Update the running summary of a conversation between a user and an assistant. "
+    "Keep names, numbers, decisions, preferences and open questions; drop pleasantries. "
+    "Plain prose, at most {words} words. Output only the summary."
+)
+
+def _tokens(msgs: List[Dict[str, str]]) -> int:
+    return sum(approx_tokens(m.get("content") or "") + 4 for m in msgs)
+
+def _model_summarize(prev: str, turns: List[Dict[str, str]]) -> str:
+    from .router import run_ollama_chat
+    convo = "\n".join(f"{m['role']}: {m['content']}" for m in turns)
+    msgs = [
+        {"role": "system", "content": _SUMMARY_PROMPT.format(words=int(SUMMARY_TOKENS * 0.75))},
+        {"role": "user", "content": f"Summary so far:\n{prev or '(none)'}\n\nNew turns:\n{convo}"},
+    ]
+    model = os.getenv("NOVA_SUMMARY_MODEL") or os.getenv("MODEL", "nous-hermes-13b-fast:latest")
+    text, _ = run_ollama_chat(msgs, model=model, options={"num_predict": SUMMARY_TOKENS},
+                              priority="background")
+    return text
+
+def _clip(prev: str, turns: List[Dict[str, str]]) -> str:
+    """Fallback when the model call fails: keep the gist of each user turn."""
+    bits = [prev] if prev else []
+    bits += [m["content"][:160] for m in turns if m.get("role") == "user"]
+    return " / ".join(bits)[-SUMMARY_TOKENS * 4:]
+
+class Conversation:
+    """Bounded multi-turn history: running summary + the most recent turns."""
+    def __init__(self, *, budget: int = CONVO_TOKENS, keep: int = CONVO_KEEP,
+                 summarize: Optional[Callable[[str, List[Dict[str, str]]], str]] = None):
+        self.budget = budget
+        self.keep = max(2, keep)
+        self.summary = ""
+        self.turns: List[Dict[str, str]] = []
+        self.folds = 0
+        self._summarize = summarize or _model_summarize
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def messages(self) -> List[Dict[str, str]]:
+        """History to send ahead of the next question (summary first, then recent turns)."""
+        with self._lock:
+            out = [dict(m) for m in self.turns]
+            if self.summary:
+                out.insert(0, {"role": "system", "content": f"Summary of the conversation so far: {self.summary}"})
+        return out
+
+    def add(self, user: str, assistant: str) -> None:
+        with self._lock:
+            self.turns.append({"role": "user", "content": user})
+            self.turns.append({"role": "assistant", "content": assistant or ""})
+        self._maybe_fold()
+
+    def tokens(self) -> int:
+        with self._lock:
+            return _tokens(self.turns) + approx_tokens(self.summary)
+
+    def clear(self) -> None:
+        self.wait()
+        with self._lock:
+            self.summary, self.turns = "", []
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until a running background fold finishes."""
+        w = self._worker
+        if w is not None:
+            w.join(timeout)
+
+    def _maybe_fold(self) -> None:
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return  # one fold at a time; the next add() re-checks
+            if _tokens(self.turns) + approx_tokens(self.summary) <= self.budget:
+                return
+            n = len(self.turns) - self.keep
+            n -= n % 2  # fold whole user/assistant pairs
+            if n <= 0:
+                return
+            old, prev = self.turns[:n], self.summary
+            self._worker = threading.Thread(target=self._fold, args=(prev, old), daemon=True)
+            self._worker.start()
+
+    def _fold(self, prev: str, old: List[Dict[str, str]]) -> None:
+        try:
+            summary = (self._summarize(prev, old) or "").strip()
+        except Exception as e:
+            diag(f"[convo] summarize failed: {e}")
+            summary = ""
+        summary = summary or _clip(prev, old)
+        with self._lock:
+            # turns only ever grow at the tail (or clear() emptied them), so the
+            # folded messages are still the head of the list unless cleared
+            if self.turns[:len(old)] == old:
+                del self.turns[:len(old)]
+                self.summary = summary
+                self.folds += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"turns": len(self.turns), "tokens": _tokens(self.turns) + approx_tokens(self.summary),
+                    "summary_tokens": approx_tokens(self.summary), "folds": self.folds,
+                    "budget": self.budget}
+
+# ---- sessions --------------------------------------------------------------
+
+_SESSIONS: Dict[str, Conversation] = {}
+_SESSIONS_LOCK = threading.Lock()
+_ON = CONVO_ON
+
+def enabled() -> bool:
+    return _ON
+
+def set_enabled(on: bool) -> None:
+    global _ON
+    _ON = bool(on)
+
+def session(sid: str = "default") -> Conversation:
+    with _SESSIONS_LOCK:
+        c = _SESSIONS.get(sid)
+        if c is None:
+            c = _SESSIONS[sid] = Conversation()
+        return c
+
+def drop(sid: str = "default") -> None:
+    with _SESSIONS_LOCK:
+        _SESSIONS.pop(sid, None)
+
+def fit(history: List[Dict[str, str]], budget: int = CONVO_TOKENS) -> List[Dict[str, str]]:
+    """Most recent messages of a caller-supplied history that fit in `budget` tokens."""
+    out: List[Dict[str, str]] = []
+    used = 0
+    for m in reversed(history or []):
+        if m.get("role") not in ("user", "assistant", "system") or not m.get("content"):
+            continue
+        used += approx_tokens(m["content"]) + 4
+        if used > budget and out:
+            break
+        out.append({"role": m["role"], "content": m["content"]})
+    return out[::-1]
@@ -0,0 +1,124 @@
+# nova/core/http_pool.py
+from __future__ import annotations
+import http.client, json, threading, urllib.parse
+from typing import Dict, Iterator, List, Tuple
+
+# Errors that mean "the idle keep-alive socket went stale" → retry once on a fresh one.
+_STALE = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+          http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+class HTTPPool:
+    """
+    Small thread-safe keep-alive pool for one base URL (http.client based).
+    Keeps at most `size` idle connections; extra connections opened under load
+    are closed when handed back. Counters: hits (idle socket reused), misses
+    (new socket), stale (reused socket had died and was replaced).
+    """
+    def __init__(self, base_url: str, *, size: int = 4, timeout: float = 45):
+        u = urllib.parse.urlsplit(base_url if "://" in base_url else f"http://{base_url}")
+        self.scheme = u.scheme or "http"
+        self.host = u.hostname or "localhost"
+        self.port = u.port
+        self.prefix = (u.path or "").rstrip("/")
+        self.size = max(0, int(size))
+        self.timeout = timeout
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.stale = 0
+
+    # ---- checkout / checkin ----
+    def _new(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _checkout(self) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                self.hits += 1
+                return self._idle.pop(), True
+            self.misses += 1
+        return self._new(), False
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _open(self, method: str, path: str, body: bytes | None, headers: Dict[str, str]):
+        """Send the request; returns (conn, response). Retries once if a reused socket was stale."""
+        conn, reused = self._checkout()
+        try:
+            conn.request(method, self.prefix + path, body=body, headers=headers)
+            return conn, conn.getresponse()
+        except _STALE:
+            conn.close()
+            if not reused:
+                raise
+            with self._lock:
+                self.stale += 1
+            conn = self._new()
+            try:
+                conn.request(method, self.prefix + path, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+    @staticmethod
+    def _check(resp, conn) -> None:
+        if resp.status >= 400:
+            detail = resp.read()[:300].decode("utf-8", "ignore")
+            conn.close()
+            raise RuntimeError(f"HTTP {resp.status} {resp.reason}: {detail}")
+
+    # ---- public ----
+    def post_json(self, path: str, payload: dict) -> dict:
+        body = json.dumps(payload).encode("utf-8")
+        conn, resp = self._open("POST", path, body, {"Content-Type": "application/json"})
+        self._check(resp, conn)
+        try:
+            data = resp.read()
+        except Exception:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+        return json.loads(data.decode("utf-8"))
+
+    def stream_lines(self, path: str, payload: dict) -> Iterator[bytes]:
+        """POST JSON and yield response lines as they arrive. The socket goes back to
+        the pool only if the body was read to the end; early close discards it."""
+        body = json.dumps(payload).encode("utf-8")
+        conn, resp = self._open("POST", path, body, {"Content-Type": "application/json"})
+        self._check(resp, conn)
+        finished = False
+        try:
+            while True:
+                line = resp.readline()
+                if not line:
+                    break
+                yield line
+            finished = True
+        finally:
+            if finished and not resp.will_close:
+                self._checkin(conn)
+            else:
+                conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": self.size, "idle": len(self._idle),
+                    "hits": self.hits, "misses": self.misses, "stale": self.stale}
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for c in idle:
+            c.close()
@@ -0,0 +1,125 @@
+# nova/core/keepwarm.py
+from __future__ import annotations
+import os, re, threading, time
+from typing import Dict, Iterable, List, Optional
+
+from ..logging import diag
+
+# Keep-warm scheduler: Ollama unloads a model NOVA_KEEP_ALIVE after its last request,
+# and the next question then pays a multi-second load. A daemon thread re-pings every
+# recently used model shortly before that deadline. Models idle for longer than
+# NOVA_KEEPWARM_MAX_IDLE are let go so their VRAM is freed.
+# The router calls touch() on every model request; the first real one starts the
+# thread, so a run that never reaches a model never starts it.
+KEEPWARM_ON = os.getenv("NOVA_KEEPWARM", "1").lower() in ("1", "true", "yes", "on")
+KEEP_ALIVE = os.getenv("NOVA_KEEP_ALIVE", "20m")
+MAX_IDLE_S = float(os.getenv("NOVA_KEEPWARM_MAX_IDLE", str(4 * 3600)))
+
+def _seconds(spec: str) -> float:
+    """Ollama keep_alive syntax ("20m", "1h", "300s", "300") → seconds; negative = forever."""
+    m = re.fullmatch(r"\s*(-?\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*", str(spec or ""))
+    if not m:
+        return 300.0
+    n = float(m.group(1))
+    return n * {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[m.group(2)]
+
+KEEP_ALIVE_S = _seconds(KEEP_ALIVE)
+# The loop wakes every _STEP_S and pings a model once it has been idle for
+# KEEP_ALIVE_S - _MARGIN_S. The margin is two steps, so the check that sees a model due
+# still has a full step (plus queueing in the background lane) before the keep-alive
+# lapses; the step is at most a quarter of the keep-alive, so the margin never exceeds
+# half of it and a short keep-alive doesn't turn into constant pinging.
+_STEP_S = max(1.0, min(60.0, KEEP_ALIVE_S / 4)) if KEEP_ALIVE_S > 0 else 60.0
+_MARGIN_S = min(2 * _STEP_S, KEEP_ALIVE_S / 2) if KEEP_ALIVE_S > 0 else 0.0
+
+_LOCK = threading.Lock()
+_THREAD: Optional[threading.Thread] = None
+_LAST_USE: Dict[str, float] = {}   # model -> last request of any kind (chat, warm, ping)
+_LAST_ASK: Dict[str, float] = {}   # model -> last real (non-ping) use
+_STATS: Dict[str, Dict] = {}
+
+def touch(model: str, *, ping: bool = False) -> None:
+    """Record a request to `model` (Ollama's keep-alive clock restarts on every request)."""
+    if not model:
+        return
+    now = time.time()
+    with _LOCK:
+        _LAST_USE[model] = now
+        if not ping:
+            _LAST_ASK[model] = now
+            _ensure_thread()
+
+def _record(model: str, res: Dict) -> None:
+    with _LOCK:
+        st = _STATS.setdefault(model, {"warms": 0, "errors": 0, "loads": 0, "load_ms_total": 0.0})
+        if not res.get("ok"):
+            st["errors"] += 1
+            st["last_error"] = res.get("error")
+            return
+        st["warms"] += 1
+        st["last_ms"] = res.get("ms")
+        ld = res.get("load_duration_ms")
+        if ld is not None:
+            st["last_load_ms"] = ld
+            if ld >= 1:  # ~0 means the model was still resident
+                st["loads"] += 1
+                st["load_ms_total"] += ld
+        st["last_warm"] = time.time()
+
+def warm(model: str, *, ping: bool = False) -> Dict:
+    """Synchronously load/refresh `model`; returns router.warm_model's result (with load_duration_ms)."""
+    from .router import warm_model
+    res = warm_model(model, priority="background" if ping else "interactive")
+    touch(model, ping=ping)
+    _record(model, res)
+    return res
+
+def warm_async(models: Iterable[str]) -> None:
+    """Warm in the background so startup never waits on a model load."""
+    models = [m for m in models if m]
+    for m in models:
+        touch(m)
+    threading.Thread(target=lambda: [warm(m, ping=True) for m in models], name="nova-warm", daemon=True).start()
+
+def _due(now: float) -> List[str]:
+    if KEEP_ALIVE_S <= 0:
+        return []  # keep_alive=-1: Ollama never unloads; 0: unloads at once, nothing to keep
+    with _LOCK:
+        return [m for m, last in _LAST_USE.items()
+                if now - last >= KEEP_ALIVE_S - _MARGIN_S
+                and now - _LAST_ASK.get(m, 0.0) <= MAX_IDLE_S]
+
+def _loop() -> None:
+    while True:
+        time.sleep(_STEP_S)
+        for m in _due(time.time()):
+            res = warm(m, ping=True)
+            diag(f"[keepwarm] ping {m}: {res.get('ms')}ms load={res.get('load_duration_ms')}ms ok={res.get('ok')}")
+
+def _ensure_thread() -> None:
+    """Start the ping thread if it isn't running (caller holds _LOCK)."""
+    global _THREAD
+    if KEEPWARM_ON and (_THREAD is None or not _THREAD.is_alive()):
+        _THREAD = threading.Thread(target=_loop, name="nova-keepwarm", daemon=True)
+        _THREAD.start()
+
+def start(models: Iterable[str] = ()) -> None:
+    """Start the scheduler (idempotent) and warm `models` in the background."""
+    if not KEEPWARM_ON:
+        return
+    with _LOCK:
+        _ensure_thread()
+    warm_async(models)
+
+def stats() -> Dict:
+    now = time.time()
+    with _LOCK:
+        out = {}
+        for m in set(_LAST_USE) | set(_STATS):
+            st = dict(_STATS.get(m, {}))
+            n = st.pop("loads", 0); tot = st.pop("load_ms_total", 0.0)
+            st["loads"] = n
+            st["avg_load_ms"] = round(tot / n, 1) if n else 0.0
+            st["idle_s"] = int(now - _LAST_ASK.get(m, _LAST_USE.get(m, now)))
+            out[m] = st
+        return {"keep_alive": KEEP_ALIVE, "running": bool(_THREAD and _THREAD.is_alive()), "models": out}
@@ -1,57 +1,200 @@
 # nova/core/memory.py
 from __future__ import annotations
-import json, os, time, re
-from typing import List, Dict, Optional
+import json, os, time, re, sqlite3, threading
+from typing import Callable, List, Dict, Optional
+from . import vectors as VEC
 
 _DIR = os.path.expanduser("~/.nova")
-_PATH = os.path.join(_DIR, "memory.jsonl")
+_PATH = os.path.join(_DIR, "memory.jsonl")          # legacy store, imported once
+_DB_PATH = os.path.join(_DIR, "memory.sqlite3")
 
-def _ensure():
-    os.makedirs(_DIR, exist_ok=True)
-    if not os.path.exists(_PATH):
-        with open(_PATH, "w", encoding="utf-8") as f: pass
+# Indexed store: SQLite (WAL) with indexes on id, ts and (tag, ts), plus an FTS5
+# table mirroring `text` for ranked `q=` search. Without FTS5 in the local sqlite
+# build, q= falls back to a LIKE scan. The old JSONL is renamed to *.migrated.
+_LOCK = threading.RLock()
+_DB: Optional[sqlite3.Connection] = None
+_FTS = False
 
-def remember(text: str, tag: Optional[str] = None) -> Dict:
-    _ensure()
-    rec = {"id": str(int(time.time()*1000)), "ts": time.time(), "text": text, "tag": tag}
-    with open(_PATH, "a", encoding="utf-8") as f:
-        f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-    return rec
+# Retrieval for prompts: each memory is embedded once at remember() time into a
+# float32 matrix next to the database (memory_vec.f32, mmap'd; row metadata in
+# memory_vec.jsonl). At question time one dot product picks the top-k, which are
+# injected under a small token budget. Needs numpy + an embedding model; otherwise
+# memories are simply not injected.
+RAG_ON = os.getenv("NOVA_MEMORY_RAG", "1").lower() in ("1", "true", "yes", "on")
+RAG_K = int(os.getenv("NOVA_MEMORY_K", "3"))
+RAG_MIN = float(os.getenv("NOVA_MEMORY_MIN", "0.35"))
+RAG_TOKENS = int(os.getenv("NOVA_MEMORY_TOKENS", "200"))
 
-def load_all() -> List[Dict]:
-    _ensure()
-    out = []
+_VEC = VEC.VectorStore(os.path.join(_DIR, "memory_vec"))
+_EMBEDDER: Optional[Callable[[str], List[float]]] = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mem(rowid INTEGER PRIMARY KEY, id TEXT NOT NULL, ts REAL NOT NULL, text TEXT, tag TEXT);
+CREATE INDEX IF NOT EXISTS mem_id ON mem(id);
+CREATE INDEX IF NOT EXISTS mem_ts ON mem(ts);
+CREATE INDEX IF NOT EXISTS mem_tag_ts ON mem(tag, ts);
+CREATE TABLE IF NOT EXISTS mem_gen(id INTEGER PRIMARY KEY CHECK (id = 0), rows INTEGER NOT NULL, gen INTEGER NOT NULL);
+"""
+# mem_gen holds the row count and a generation counter, updated in the same transaction
+# as every insert/delete: generation() is one primary-key read, and a /forget in one
+# process re-keys memory-aware answers cached by another.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS mem_fts USING fts5(text, content='mem', content_rowid='rowid');
+CREATE TRIGGER IF NOT EXISTS mem_ai AFTER INSERT ON mem BEGIN
+  INSERT INTO mem_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS mem_ad AFTER DELETE ON mem BEGIN
+  INSERT INTO mem_fts(mem_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+"""
+
+def _migrate(c: sqlite3.Connection) -> None:
+    if not os.path.exists(_PATH):
+        return
+    rows = []
     with open(_PATH, "r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
             if not line: continue
             try:
-                out.append(json.loads(line))
+                r = json.loads(line)
+                rows.append((str(r.get("id") or int(float(r.get("ts", 0))*1000)),
+                             float(r.get("ts", 0)), r.get("text", ""), r.get("tag")))
             except Exception:
                 pass
-    return out
+    with c:
+        c.executemany("INSERT INTO mem(id, ts, text, tag) VALUES (?,?,?,?)", rows)
+        c.execute("UPDATE mem_gen SET rows = rows + ?, gen = gen + 1 WHERE id = 0", (len(rows),))
+    os.replace(_PATH, _PATH + ".migrated")
+
+def _db() -> sqlite3.Connection:
+    global _DB, _FTS
+    with _LOCK:
+        if _DB is None:
+            os.makedirs(_DIR, exist_ok=True)
+            c = sqlite3.connect(_DB_PATH, check_same_thread=False)
+            c.row_factory = sqlite3.Row
+            c.execute("PRAGMA journal_mode=WAL"); c.execute("PRAGMA synchronous=NORMAL")
+            c.executescript(_SCHEMA)
+            try:
+                c.executescript(_FTS_SCHEMA)
+                _FTS = True
+            except sqlite3.OperationalError:
+                _FTS = False  # sqlite built without FTS5
+            c.commit()
+            try: _migrate(c)
+            except Exception: pass
+            with c:  # first open (or a database from before mem_gen): count once
+                c.execute("INSERT OR IGNORE INTO mem_gen(id, rows, gen) SELECT 0, count(*), 0 FROM mem")
+            _DB = c
+        return _DB
+
+def generation() -> str:
+    """Memory-set version ("rows.gen"), the same in every process (for cache keys of memory-aware answers)."""
+    with _LOCK:
+        return "%d.%d" % tuple(_db().execute("SELECT rows, gen FROM mem_gen WHERE id = 0").fetchone())
+
+def set_embedder(fn: Optional[Callable[[str], List[float]]]) -> None:
+    """Swap the embedding function (e.g. a local stand-in for tests); None → Ollama."""
+    global _EMBEDDER
+    _EMBEDDER = fn
+
+def _embed(text: str) -> Optional[List[float]]:
+    if not (RAG_ON and VEC.available()):
+        return None
+    try:
+        if _EMBEDDER is not None:
+            return _EMBEDDER(text)
+        from . import router as ROUTER
+        return ROUTER.embed(text)
+    except Exception:
+        return None
+
+def _rec(row) -> Dict:
+    return {"id": row["id"], "ts": row["ts"], "text": row["text"], "tag": row["tag"]}
+
+def remember(text: str, tag: Optional[str] = None) -> Dict:
+    rec = {"id": str(int(time.time()*1000)), "ts": time.time(), "text": text, "tag": tag}
+    with _LOCK:
+        c = _db()
+        with c:
+            c.execute("INSERT INTO mem(id, ts, text, tag) VALUES (?,?,?,?)",
+                      (rec["id"], rec["ts"], rec["text"], rec["tag"]))
+            c.execute("UPDATE mem_gen SET rows = rows + 1, gen = gen + 1 WHERE id = 0")
+    vec = _embed(text)
+    if vec:
+        _VEC.add(vec, {"group": "mem", "id": rec["id"], "text": text})
+    return rec
+
+def load_all() -> List[Dict]:
+    with _LOCK:
+        rows = _db().execute("SELECT id, ts, text, tag FROM mem ORDER BY ts, rowid").fetchall()
+    return [_rec(r) for r in rows]
+
+def _fts_query(q: str) -> str:
+    # Every word must match (as a prefix, so "app" still finds "apple"); quoting keeps
+    # FTS5 operators in user text from being interpreted.
+    words = re.findall(r"\w+", q)
+    return " ".join('"%s"*' % w for w in words)
 
 def recall(q: Optional[str] = None, tag: Optional[str] = None, last: Optional[int] = None) -> List[Dict]:
-    items = load_all()
+    """Newest first; with `q`, best full-text match first. `last=N` caps the result."""
+    limit = max(1, int(last)) if last else -1
+    where, args = [], []
     if tag:
-        items = [r for r in items if r.get("tag")==tag]
-    if q:
-        rx = re.compile(re.escape(q), re.I)
-        items = [r for r in items if rx.search(r.get("text","") or "")]
-    items.sort(key=lambda r: r.get("ts",0), reverse=True)
-    if last:
-        items = items[:max(1,int(last))]
-    return items
+        where.append("m.tag = ?"); args.append(tag)
+    with _LOCK:
+        c = _db()
+        if q and _FTS and _fts_query(q):
+            sql = ("SELECT m.id, m.ts, m.text, m.tag FROM mem_fts JOIN mem m ON m.rowid = mem_fts.rowid "
+                   "WHERE mem_fts MATCH ?" + "".join(" AND " + w for w in where) +
+                   " ORDER BY bm25(mem_fts), m.ts DESC LIMIT ?")
+            rows = c.execute(sql, [_fts_query(q)] + args + [limit]).fetchall()
+        else:
+            if q:
+                where.append("m.text LIKE ? ESCAPE '\\'")
+                args.append("%" + re.sub(r"([\\%_])", r"\\\1", q) + "%")
+            sql = ("SELECT m.id, m.ts, m.text, m.tag FROM mem m" +
+                   (" WHERE " + " AND ".join(where) if where else "") +
+                   " ORDER BY m.ts DESC LIMIT ?")
+            rows = c.execute(sql, args + [limit]).fetchall()
+    return [_rec(r) for r in rows]
 
 def forget(id_or_all: str) -> int:
-    items = load_all()
-    if id_or_all.lower() == "all":
-        if os.path.exists(_PATH):
-            os.remove(_PATH)
-        _ensure()
-        return 0
-    kept = [r for r in items if r.get("id") != id_or_all]
-    with open(_PATH, "w", encoding="utf-8") as f:
-        for r in kept:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
-    return len(items) - len(kept)
+    with _LOCK:
+        c = _db()
+        if id_or_all.lower() == "all":
+            with c:
+                c.execute("DELETE FROM mem")
+                c.execute("UPDATE mem_gen SET rows = 0, gen = gen + 1 WHERE id = 0")
+            _VEC.clear()
+            return 0
+        with c:
+            n = c.execute("DELETE FROM mem WHERE id = ?", (id_or_all,)).rowcount
+            if n:
+                c.execute("UPDATE mem_gen SET rows = rows - ?, gen = gen + 1 WHERE id = 0", (n,))
+    if n:
+        _VEC.drop(lambda m: m.get("id") == id_or_all)
+    return n
+
+def relevant(q: str, *, k: int = RAG_K, budget_tokens: int = RAG_TOKENS) -> List[str]:
+    """Texts of the memories closest to `q` (best first), trimmed to ~budget_tokens."""
+    # nothing embedded yet (no memories, or none while an embedder was reachable):
+    # don't pay for embedding the question
+    if not RAG_ON or not VEC.available() or generation().startswith("0.") or not len(_VEC):
+        return []
+    vec = _embed(q)
+    if not vec:
+        return []
+    out: List[str] = []
+    used = 0
+    for score, _, m in _VEC.search(vec, group="mem", k=k):
+        if score < RAG_MIN:
+            break
+        text = (m.get("text") or "").strip()
+        cost = (len(text) + 3) // 4
+        if not text or used + cost > budget_tokens:
+            continue
+        out.append(text)
+        used += cost
+    return out
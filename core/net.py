@@ -0,0 +1,198 @@
+# nova/core/net.py
+from __future__ import annotations
+import os, threading, time, urllib.error, urllib.request
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Shared outbound HTTP guard for web search/fetch and the skills (weather, fx).
+# Per host:
+#  - token bucket: NOVA_NET_RATE requests/s with bursts of NOVA_NET_BURST; a caller
+#    waits for a token, or fails at once if the wait would outlast its timeout;
+#  - circuit breaker: NOVA_NET_BREAKER_FAILS consecutive errors/timeouts/5xx/429 open
+#    it, and for NOVA_NET_BREAKER_COOLDOWN seconds requests fail in microseconds
+#    instead of waiting out a timeout. Then one probe is let through (half-open):
+#    success closes the breaker, failure re-opens it;
+#  - latency histogram of completed requests.
+# A host matches itself and its subdomains in the rate table, so html.duckduckgo.com
+# and duckduckgo.com share one bucket.
+NET_RATE = float(os.getenv("NOVA_NET_RATE", "4"))
+NET_BURST = float(os.getenv("NOVA_NET_BURST", "4"))
+BREAKER_FAILS = int(os.getenv("NOVA_NET_BREAKER_FAILS", "3"))
+BREAKER_COOLDOWN_S = float(os.getenv("NOVA_NET_BREAKER_COOLDOWN", "30"))
+
+# Per-domain (rate/s, burst); override/extend with NOVA_NET_RATES="wttr.in=1:2,example.com=10".
+_DOMAIN_RATE: Dict[str, Tuple[float, float]] = {
+    "duckduckgo.com": (1.0, 4.0),
+    "wttr.in": (1.0, 2.0),
+    "api.frankfurter.app": (2.0, 4.0),
+}
+for _kv in (os.getenv("NOVA_NET_RATES", "") or "").split(","):
+    if "=" in _kv:
+        _h, _v = _kv.split("=", 1)
+        _r, _, _b = _v.partition(":")
+        try: _DOMAIN_RATE[_h.strip().lower()] = (float(_r), float(_b or _r))
+        except ValueError: pass
+
+_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class CircuitOpen(urllib.error.URLError):
+    """The host's breaker is open: failing fast instead of calling it."""
+
+class RateLimited(urllib.error.URLError):
+    """No token for the host within the caller's timeout."""
+
+def _failed_status(status: int) -> bool:
+    return status >= 500 or status == 429
+
+class _Host:
+    def __init__(self, name: str, rate: float, burst: float):
+        self.name = name
+        self.rate = max(0.01, rate)
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.refilled = time.monotonic()
+        self.state = "closed"   # closed | open | half_open
+        self.fails = 0          # consecutive
+        self.opened_at = 0.0
+        self.probing = False
+        self.hist = [0] * (len(_BUCKETS_MS) + 1)
+        self.n = self.errors = self.opens = self.rejected = self.limited = 0
+        self.total_ms = 0.0
+
+    def admit(self, timeout: float) -> float:
+        """Breaker check + token reservation (caller holds _LOCK); returns seconds to wait first."""
+        now = time.monotonic()
+        if self.state == "open":
+            if now - self.opened_at < BREAKER_COOLDOWN_S:
+                self.rejected += 1
+                raise CircuitOpen(f"{self.name}: circuit open")
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self.probing:
+                self.rejected += 1
+                raise CircuitOpen(f"{self.name}: circuit half-open, probe in flight")
+            self.probing = True
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+        wait = max(0.0, (1.0 - self.tokens) / self.rate)
+        if wait > timeout:
+            self.probing = False
+            self.limited += 1
+            raise RateLimited(f"{self.name}: rate limited")
+        self.tokens -= 1.0  # may go negative: the wait pays it back
+        return wait
+
+    def record(self, ok: Optional[bool], ms: Optional[float]) -> None:
+        self.probing = False
+        if ok is None:
+            return  # abandoned by the caller (e.g. cancelled): says nothing about the host
+        if ms is not None:
+            self.n += 1
+            self.total_ms += ms
+            i = 0
+            while i < len(_BUCKETS_MS) and ms > _BUCKETS_MS[i]:
+                i += 1
+            self.hist[i] += 1
+        if ok:
+            self.fails = 0
+            self.state = "closed"
+            return
+        self.errors += 1
+        self.fails += 1
+        if self.state == "half_open" or self.fails >= BREAKER_FAILS:
+            if self.state != "open":
+                self.opens += 1
+            self.state, self.opened_at = "open", time.monotonic()
+
+    def _pct(self, p: float) -> Optional[int]:
+        need = p * self.n
+        seen = 0
+        for i, c in enumerate(self.hist):
+            seen += c
+            if c and seen >= need:
+                return _BUCKETS_MS[i] if i < len(_BUCKETS_MS) else None
+        return None
+
+    def stats(self) -> Dict:
+        hist = {f"<={b}ms": c for b, c in zip(_BUCKETS_MS, self.hist)}
+        hist[f">{_BUCKETS_MS[-1]}ms"] = self.hist[-1]
+        return {"state": self.state, "consecutive_fails": self.fails, "opens": self.opens,
+                "rejected": self.rejected, "rate_limited": self.limited,
+                "requests": self.n, "errors": self.errors,
+                "avg_ms": round(self.total_ms / self.n, 1) if self.n else 0.0,
+                "p50_ms": self._pct(0.5), "p95_ms": self._pct(0.95),
+                "rate": self.rate, "burst": self.burst, "latency": hist}
+
+_LOCK = threading.Lock()
+_HOSTS: Dict[str, _Host] = {}
+
+def _key(url: str) -> Tuple[str, Tuple[float, float]]:
+    u = urlsplit(url)
+    host = (u.hostname or "").lower()
+    h = host
+    while h:
+        if h in _DOMAIN_RATE:
+            return h, _DOMAIN_RATE[h]
+        h = h.partition(".")[2]
+    return (f"{host}:{u.port}" if u.port else host), (NET_RATE, NET_BURST)
+
+def _host(url: str) -> _Host:
+    key, (rate, burst) = _key(url)
+    h = _HOSTS.get(key)
+    if h is None:
+        h = _HOSTS[key] = _Host(key, rate, burst)
+    return h
+
+def admit(url: str, timeout: float) -> float:
+    """
+    Ask to call `url`'s host. Returns how long to wait before sending (sleep or
+    asyncio.sleep it). Raises CircuitOpen / RateLimited. Every admitted call must
+    be followed by record().
+    """
+    with _LOCK:
+        return _host(url).admit(timeout)
+
+def record(url: str, ok: Optional[bool], ms: Optional[float] = None) -> None:
+    """
+    Outcome of an admitted call: ok=False for timeouts, connection errors, 5xx and 429;
+    ok=None when the caller gave up on it (no verdict on the host).
+    """
+    with _LOCK:
+        _host(url).record(ok, ms)
+
+def request(url: str, *, timeout: float, headers: Optional[Dict[str, str]] = None):
+    """
+    Guarded urllib GET returning (status, body, response headers); a 304 comes back
+    as a status. Other HTTP errors raise urllib.error.HTTPError as usual.
+    """
+    wait = admit(url, timeout)
+    if wait:
+        time.sleep(wait)
+    req = urllib.request.Request(url, headers=headers or {})
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        with urllib.request.urlopen(req, timeout=max(0.1, timeout - wait)) as r:
+            out = r.status, r.read(), r.headers
+        ok = True
+        return out
+    except urllib.error.HTTPError as e:
+        ok = not _failed_status(e.code)  # the host answered; 4xx is not an outage
+        if e.code == 304:
+            return 304, b"", e.headers
+        raise
+    finally:
+        record(url, ok, (time.perf_counter() - t0) * 1000)
+
+def get(url: str, *, timeout: float, headers: Optional[Dict[str, str]] = None) -> bytes:
+    return request(url, timeout=timeout, headers=headers)[1]
+
+def stats() -> Dict:
+    with _LOCK:
+        return {"breaker_fails": BREAKER_FAILS, "cooldown_s": BREAKER_COOLDOWN_S,
+                "hosts": {k: h.stats() for k, h in _HOSTS.items()}}
+
+def reset() -> None:
+    """Forget all host state (breakers, buckets, histograms)."""
+    with _LOCK:
+        _HOSTS.clear()
@@ -1,6 +1,7 @@
 # nova/core/persona.py
 from __future__ import annotations
-from typing import Dict, List, Optional
+import hashlib, json, threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from . import prefs as PREFS
 
 # ---- Trait library ---------------------------------------------------------
@@ -75,7 +76,7 @@ def _coerce_state_dict() -> dict:
     if greeting is not None and not isinstance(greeting, str):
         greeting = str(greeting)
 
-    s = {"layers": layers, "greeting": greeting}
+    s = {"layers": layers, "professional": bool(s.get("professional")), "greeting": greeting}
     _save(s)
     return s
 # --- END PATCH ---
@@ -143,27 +144,6 @@ def set_professional(on: bool):
 def is_professional() -> bool:
     return bool(_state().get("professional"))
 
-def compose_system_rules() -> str:
-    """
-    Build a compact system rule string from persona layers + optional greeting rule.
-    Keep it light-touch so it never harms helpfulness.
-    """
-    s = _coerce_state_dict()
-    bits: list[str] = []
-
-    layers = s.get("layers") or []
-    if layers:
-        bits.append(
-            "Adopt these persona traits with a light touch and never sacrifice clarity or usefulness: "
-            + ", ".join(layers) + "."
-        )
-
-    g = s.get("greeting")
-    if g:
-        bits.append(f"When the user greets you, reply exactly: {g}")
-
-    return " ".join(bits).strip()
-
 # ---- Composer --------------------------------------------------------------
 
 BASE_RULES = (
@@ -171,23 +151,65 @@ BASE_RULES = (
     "Decline unsafe requests politely."
 )
 
-def compose_system_rules(extra: str = "") -> str:
+class Composed(NamedTuple):
+    text: str
+    state: str    # state_hash() the text was built from
+    tokens: int   # approx_tokens(text): prompt-eval cost of the block on a cold cache
+
+# (state hash, extra) -> Composed. Persona state only changes via /persona and
+# /greeting, so this stays tiny; it is cleared if it ever grows past a few entries.
+_COMPOSED: Dict[Tuple[str, str], Composed] = {}
+_COMPOSED_LOCK = threading.Lock()
+
+def approx_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token for English on llama-style tokenizers)."""
+    return (len(text or "") + 3) // 4
+
+def _state_key(s: Dict) -> str:
+    return json.dumps([s.get("layers") or [], bool(s.get("professional")), s.get("greeting")],
+                      ensure_ascii=False)
+
+def state_hash() -> str:
+    """Short hash of everything that shapes the system prompt (layers, professional, greeting)."""
+    return hashlib.sha1(_state_key(_coerce_state_dict()).encode("utf-8")).hexdigest()[:12]
+
+def _build(s: Dict, extra: str) -> str:
     parts: List[str] = [BASE_RULES]
     # stacked traits
-    for name in get_layers():
+    for name in s.get("layers") or []:
         sys = TRAITS.get(name, {}).get("system")
         if sys: parts.append(sys)
     # professional mode overrides
-    if is_professional():
+    if s.get("professional"):
         parts.append(TRAITS["professional"]["system"])
     # optional greeting template (only a guideline)
-    g = get_greeting()
+    g = s.get("greeting")
     if g:
         parts.append(f"When the user greets, respond with exactly: {g}")
     if extra:
         parts.append(extra)
     return "\n".join(parts)
 
+def compose(extra: str = "") -> Composed:
+    """System prompt for the current persona state, memoized on state_hash()."""
+    s = _coerce_state_dict()
+    h = hashlib.sha1(_state_key(s).encode("utf-8")).hexdigest()[:12]
+    key = (h, extra or "")
+    with _COMPOSED_LOCK:
+        hit = _COMPOSED.get(key)
+    if hit is not None:
+        return hit
+    text = _build(s, extra)
+    c = Composed(text, h, approx_tokens(text))
+    with _COMPOSED_LOCK:
+        if len(_COMPOSED) >= 16:
+            _COMPOSED.clear()
+        _COMPOSED[key] = c
+    return c
+
+def compose_system_rules(extra: str = "") -> str:
+    return compose(extra).text
+
 def describe_state() -> Dict:
     return {
         "layers": get_layers(),
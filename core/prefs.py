@@ -1,13 +1,35 @@
-import os, json
+import os, json, copy, threading
 from pathlib import Path
 _CFG=Path.home()/".config/nova"; _CFG.mkdir(parents=True, exist_ok=True)
 _FILE=_CFG/"prefs.json"
-def load(): 
-    try: return json.loads(_FILE.read_text())
-    except Exception: return {}
+# In-process cache: reparse only when the file's (mtime_ns, size) changes.
+# Callers get a deep copy, so mutating the result never leaks into the cache.
+_LOCK=threading.Lock(); _SIG=None; _DATA={}
+def _sig():
+    try: st=_FILE.stat(); return (st.st_mtime_ns, st.st_size)
+    except OSError: return None
+def load():
+    global _SIG, _DATA
+    sig=_sig()
+    if sig is None: return {}
+    with _LOCK:
+        if sig!=_SIG:
+            try: _DATA=json.loads(_FILE.read_text()); _SIG=sig
+            except Exception: return {}
+        return copy.deepcopy(_DATA)
 def save(d):
-    try: _FILE.write_text(json.dumps(d, indent=2)); return True
-    except Exception: return False
+    """Atomic write (temp file + rename), skipped when nothing changed."""
+    global _SIG, _DATA
+    with _LOCK:
+        if _SIG is not None and _SIG==_sig() and d==_DATA: return True
+        tmp=_FILE.with_name(f".{_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_text(json.dumps(d, indent=2)); os.replace(tmp, _FILE)
+            _DATA=copy.deepcopy(d); _SIG=_sig(); return True
+        except Exception:
+            try: tmp.unlink()
+            except OSError: pass
+            return False
 def set_flag(key, on):
     st=load(); st[key]=bool(on); save(st); return st
 
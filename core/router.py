@@ -1,17 +1,18 @@
 # nova/core/router.py
 from __future__ import annotations
-import json, time, os, urllib.request
-from typing import List, Tuple, Dict, Any
+import json, time, os, re, hashlib, threading, heapq, itertools
+from contextlib import contextmanager
+from collections import OrderedDict
+from typing import List, Tuple, Dict, Any, Iterator, Optional
 from ..logging import diag, timing
 from .skills import units, mathx, timex
+from .http_pool import HTTPPool
+from . import keepwarm as KEEPWARM
+from .persona import approx_tokens
 OLLAMA = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 
 OLLAMA_TIMEOUT_S=int(os.getenv('NOVA_OLLAMA_TIMEOUT','45'))
 # Skills (module-centric)
-try:
-    from .skills import weather  # optional; may not exist yet
-except Exception:
-    weather = None
 # Optional skills
 try:
     from .skills import fxx  # forex
@@ -24,90 +25,252 @@ except Exception:
     weather = None
 # --- Generic skill pass: call the first skill that handles the query ---
 
-import os
 _TRACE = os.getenv("NOVA_TRACE","0") == "1"
 
-def _call_try_handle(mod, q: str):
-    for fn_name in ("try_handle", "handle", "skill"):
-        f = getattr(mod, fn_name, None)
+# --- Compiled skill dispatch (built once at import) ---
+# Each skill module may declare TRIGGER: a cheap regex that matches somewhere in every
+# query the skill could handle (a superset prefilter). All triggers are folded into one
+# alternation with a named group per skill, so a single finditer pass tells which
+# skills are worth calling. Keep triggers on disjoint character classes (digits,
+# operators, words) so one skill's match never swallows another's.
+# Skills without TRIGGER are always tried.
+def _skill_fn(mod):
+    for name in ("try_handle", "try_units", "try_mathx", "try_timex", "try_weather", "try_forex", "try_fxx"):
+        f = getattr(mod, name, None)
         if callable(f):
-            try:
-                out = f(q)
-                if out:
-                    if _TRACE:
-                        # e.g. [skill] weather.try_handle
-                        print(f"[skill] {getattr(mod, '__name__', mod)}.{fn_name}", flush=True)
-                    return out
-            except Exception:
-                if _TRACE:
-                    print(f"[skill-error] {getattr(mod, '__name__', mod)}.{fn_name}", flush=True)
-                # swallow so other skills can try
-                pass
+            return f
     return None
 
+# order of preference: FX, fast number/unit/time handlers, weather last (may go online)
+_SKILLS: List[Tuple[str, Any, Any]] = [
+    (getattr(m, "NAME", None) or m.__name__.rsplit(".", 1)[-1], m, _skill_fn(m))
+    for m in (fxx, units, mathx, timex, weather) if m is not None and _skill_fn(m)
+]
+_TRIGGER_RE = re.compile(
+    "|".join(f"(?P<{n}>{getattr(m, 'TRIGGER')})" for n, m, _ in _SKILLS if getattr(m, "TRIGGER", None))
+    or r"(?!x)x",
+    re.I,
+)
+_ALWAYS = {n for n, m, _ in _SKILLS if not getattr(m, "TRIGGER", None)}
+_SKILL_STATS: Dict[str, Dict[str, float]] = {n: {"calls": 0, "hits": 0, "errors": 0, "ms": 0.0} for n, _, _ in _SKILLS}
+_SKILL_LOCK = threading.Lock()
+
+def skill_stats() -> Dict[str, Dict[str, float]]:
+    """Per-skill calls (trigger hits), handled answers, errors and latency."""
+    with _SKILL_LOCK:
+        return {n: dict(st, avg_ms=round(st["ms"] / st["calls"], 3) if st["calls"] else 0.0)
+                for n, st in _SKILL_STATS.items()}
+
 def skill_first(q: str) -> Optional[str]:
     """
     Try lightweight skills before we even consider model/web.
     Returns already-formatted text if a skill handled it, else None.
     """
-    # collect available skill modules in order of preference
-    modules = []
-
-    # FX first if present
-    if fxx:      modules.append(fxx)
-    # fast number/unit/time handlers
-    from .skills import units, mathx, timex
-    modules += [units, mathx, timex]
-    # weather last (can be online/offline internally)
-    if weather:  modules.append(weather)
-
-    for mod in modules:
+    if not q:
+        return None
+    wanted = {m.lastgroup for m in _TRIGGER_RE.finditer(q)} | _ALWAYS
+    for name, mod, fn in _SKILLS:
+        if name not in wanted:
+            continue
+        t0 = time.perf_counter()
+        err = 0
         try:
-            out = mod.try_handle(q)  # each module exposes try_handle(q)->str|None
-        except AttributeError:
-            # legacy modules export specific names, fall back
-            for name in ("try_units", "try_mathx", "try_timex", "try_weather", "try_forex", "try_fxx"):
-                f = getattr(mod, name, None)
-                if f:
-                    out = f(q)
-                    break
+            out = fn(q)
+        except Exception:
+            out, err = None, 1  # swallow so other skills can try
+            if _TRACE:
+                print(f"[skill-error] {name}", flush=True)
+        dt = (time.perf_counter() - t0) * 1000
+        with _SKILL_LOCK:
+            st = _SKILL_STATS[name]
+            st["calls"] += 1; st["errors"] += err; st["ms"] += dt
+            if out:
+                st["hits"] += 1
         if out:
+            if _TRACE:
+                print(f"[skill] {name} {dt:.2f}ms", flush=True)
             return out
+    return None
 
-    try:
+# One keep-alive pool shared by warm_model, run_ollama_chat and the streaming path.
+_POOL = HTTPPool(OLLAMA, size=int(os.getenv("NOVA_OLLAMA_POOL", "4")), timeout=OLLAMA_TIMEOUT_S)
 
-        out = fxx.try_fxx(q)
+def pool_stats() -> dict:
+    """Keep-alive pool counters (hits = reused sockets, misses = new connections)."""
+    return _POOL.stats()
 
-        if out:
+def _post(path: str, payload: dict) -> dict:
+    return _POOL.post_json(path, payload)
 
-            return out
+def _post_stream(path: str, payload: dict) -> Iterator[dict]:
+    """POST with streaming on and yield each NDJSON object as soon as its line lands."""
+    for line in _POOL.stream_lines(path, dict(payload, stream=True)):
+        line = line.strip()
+        if not line:
+            continue
+        obj = json.loads(line.decode("utf-8"))
+        if obj.get("error"):
+            raise RuntimeError(f"ollama: {obj['error']}")
+        yield obj
 
-    except Exception:
+# ---- request scheduler ----
+# Every model request takes a slot for its model: at most NOVA_MODEL_SLOTS at once
+# (default OLLAMA_NUM_PARALLEL, else NOVA_PARALLEL, else 1). Waiting jobs start in
+# lane order (interactive > web > background), FIFO within a lane. A job with a
+# deadline is turned away up front when the estimated wait already exceeds it, or
+# later if no slot frees up in time. Ollama then never queues work we'd rather
+# reorder, so a long web synthesis can't hold up a short interactive answer.
+# A job may carry a stop event: once it is set, a queued job leaves the queue
+# (JobCancelled). A running background job with one is preemptible: a higher-lane
+# job waiting for its model sets the event, and the job (which checks it between
+# streamed pieces) gives its slot up.
+LANES = {"interactive": 0, "web": 1, "background": 2}
 
-        pass
+def _env_int(*names: str, default: int) -> int:
+    for n in names:
+        try:
+            v = int(os.getenv(n, "") or 0)
+        except ValueError:
+            v = 0
+        if v > 0:
+            return v
+    return default
 
-    return None
+MODEL_SLOTS = _env_int("NOVA_MODEL_SLOTS", "OLLAMA_NUM_PARALLEL", "NOVA_PARALLEL", default=1)
+LANE_DEADLINE_S = {
+    "interactive": float(os.getenv("NOVA_SCHED_DEADLINE_INTERACTIVE", "0")),  # 0 = wait as long as it takes
+    "web": float(os.getenv("NOVA_SCHED_DEADLINE_WEB", "30")),
+    "background": float(os.getenv("NOVA_SCHED_DEADLINE_BACKGROUND", "60")),
+}
 
-def _post(path: str, payload: dict) -> dict:
-    req = urllib.request.Request(f"{OLLAMA}{path}",
-                                 data=json.dumps(payload).encode("utf-8"),
-                                 headers={"Content-Type":"application/json"})
-    with urllib.request.urlopen(req, timeout=OLLAMA_TIMEOUT_S) as r:
-        return json.loads(r.read().decode("utf-8"))
+class SchedulerBusy(RuntimeError):
+    """A model job could not start before its deadline."""
+
+class JobCancelled(RuntimeError):
+    """A queued model job's stop event was set before it got a slot."""
+
+class _Scheduler:
+    def __init__(self, slots: int):
+        self.slots = max(1, slots)
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._busy: Dict[str, int] = {}
+        self._queue: Dict[str, List[Tuple[int, int]]] = {}  # model -> heap of (lane, seq)
+        self._svc: Dict[str, float] = {}                    # model -> EWMA seconds per job
+        self._preemptible: Dict[str, List[threading.Event]] = {}  # model -> stop events of running background jobs
+        self._lanes = {ln: {"started": 0, "rejected": 0, "cancelled": 0, "preempted": 0,
+                            "wait_ms": 0.0, "max_wait_ms": 0.0} for ln in LANES}
+        self.max_depth = 0
+
+    def _estimate(self, model: str, ticket: Tuple[int, int]) -> float:
+        ahead = sum(1 for t in self._queue.get(model, ()) if t < ticket)
+        over = self._busy.get(model, 0) + ahead - self.slots + 1
+        return 0.0 if over <= 0 else -(-over // self.slots) * self._svc.get(model, 0.0)
+
+    def _reject(self, lane: str, model: str, why: str) -> SchedulerBusy:
+        self._lanes[lane]["rejected"] += 1
+        diag(f"[sched] reject {lane} {model}: {why}")
+        return SchedulerBusy(f"ollama busy ({lane} job for {model}: {why})")
+
+    def _preempt(self, model: str) -> bool:
+        """Ask one running background job of `model` to give its slot up (caller holds _cond)."""
+        for ev in self._preemptible.get(model, ()):
+            if not ev.is_set():
+                ev.set()
+                self._lanes["background"]["preempted"] += 1
+                diag(f"[sched] preempt background {model}")
+                return True
+        return False
+
+    @contextmanager
+    def slot(self, model: str, lane: str = "interactive", deadline_s: float|None = None,
+             stop: threading.Event|None = None):
+        lane = lane if lane in LANES else "interactive"
+        if deadline_s is None:
+            deadline_s = LANE_DEADLINE_S[lane]
+        ticket = (LANES[lane], next(self._seq))
+        t0 = time.monotonic()
+        with self._cond:
+            if deadline_s > 0:
+                est = self._estimate(model, ticket)
+                if est > deadline_s:
+                    raise self._reject(lane, model, f"est. wait {est:.1f}s > {deadline_s:g}s")
+            q = self._queue.setdefault(model, [])
+            heapq.heappush(q, ticket)
+            self.max_depth = max(self.max_depth, len(q))
+            asked = False
+            while not (self._busy.get(model, 0) < self.slots and q[0] == ticket):
+                if stop is not None and stop.is_set():
+                    q.remove(ticket); heapq.heapify(q)
+                    self._cond.notify_all()
+                    self._lanes[lane]["cancelled"] += 1
+                    raise JobCancelled(f"{lane} job for {model} cancelled while queued")
+                if not asked and lane != "background" and self._busy.get(model, 0) >= self.slots:
+                    asked = self._preempt(model)
+                left = (t0 + deadline_s - time.monotonic()) if deadline_s > 0 else None
+                if left is not None and left <= 0:
+                    q.remove(ticket); heapq.heapify(q)
+                    self._cond.notify_all()
+                    raise self._reject(lane, model, f"no slot within {deadline_s:g}s")
+                if stop is not None:  # nobody notifies on stop: poll it
+                    left = 0.05 if left is None else min(left, 0.05)
+                self._cond.wait(left)
+            heapq.heappop(q)
+            self._busy[model] = self._busy.get(model, 0) + 1
+            held = stop if lane == "background" else None
+            if held is not None:
+                self._preemptible.setdefault(model, []).append(held)
+            st = self._lanes[lane]
+            waited = (time.monotonic() - t0) * 1000
+            st["started"] += 1; st["wait_ms"] += waited; st["max_wait_ms"] = max(st["max_wait_ms"], waited)
+        t1 = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._cond:
+                if held is not None:
+                    self._preemptible[model].remove(held)
+                self._busy[model] -= 1
+                dt = time.monotonic() - t1
+                prev = self._svc.get(model)
+                self._svc[model] = dt if prev is None else 0.8 * prev + 0.2 * dt
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            names = {v: k for k, v in LANES.items()}
+            models = {m: {"busy": self._busy.get(m, 0),
+                          "queued": {names[p]: sum(1 for t in q if t[0] == p) for p in names},
+                          "avg_job_s": round(self._svc.get(m, 0.0), 3)}
+                      for m, q in self._queue.items()}
+            lanes = {ln: {"started": st["started"], "rejected": st["rejected"],
+                          "cancelled": st["cancelled"], "preempted": st["preempted"],
+                          "avg_wait_ms": round(st["wait_ms"] / st["started"], 1) if st["started"] else 0.0,
+                          "max_wait_ms": round(st["max_wait_ms"], 1)}
+                     for ln, st in self._lanes.items()}
+            return {"slots": self.slots, "max_depth": self.max_depth, "models": models, "lanes": lanes}
 
-def warm_model(model: str) -> dict:
+_SCHED = _Scheduler(MODEL_SLOTS)
+
+def scheduler_stats() -> dict:
+    """Per-model busy/queued-by-lane counts and per-lane wait/reject counters."""
+    return _SCHED.stats()
+
+def warm_model(model: str, *, priority: str = "interactive") -> dict:
     t0=time.perf_counter()
     try:
-        # Ollama "generate" with keep_alive is a quick warm
-        _post("/api/generate", {"model": model, "prompt": " ", "stream": False, "keep_alive": "20m"})
-        out={"ok": True, "ms": int((time.perf_counter()-t0)*1000), "model": model, "keep_alive":"20m"}
-        diag(f"[router] warm {model}: {out['ms']}ms")
+        # Ollama "generate" without a prompt just loads the model and restarts its keep_alive
+        with _SCHED.slot(model, priority):
+            res = _post("/api/generate", {"model": model, "stream": False, "keep_alive": KEEPWARM.KEEP_ALIVE})
+        ld = res.get("load_duration")
+        out={"ok": True, "ms": int((time.perf_counter()-t0)*1000), "model": model, "keep_alive": KEEPWARM.KEEP_ALIVE,
+             "load_duration_ms": (round(ld/1e6, 1) if ld is not None else None)}
+        diag(f"[router] warm {model}: {out['ms']}ms pool={pool_stats()}")
         return out
     except Exception as e:
         return {"ok": False, "error": repr(e)}
 
-def run_ollama_chat(messages: List[Dict[str,str]], *, model: str, stream: bool=False, options: dict|None=None) -> Tuple[str, dict]:
-    t0 = time.perf_counter()
+def _flatten(messages: List[Dict[str,str]]) -> str:
     # Convert to "prompt" for /generate to keep things simple
     prompt = ""
     for m in messages:
@@ -116,22 +279,156 @@ def run_ollama_chat(messages: List[Dict[str,str]], *, model: str, stream: bool=F
         if role == "system": prompt += f"[SYS] {content}\n"
         elif role == "user": prompt += f"[USER] {content}\n"
         else: prompt += f"[ASSISTANT] {content}\n"
-    res = _post("/api/generate", {"model": model, "prompt": prompt, "stream": False})
-    text = (res.get("response") or "").strip()
-    meta = {k:res.get(k) for k in ("created_at","total_duration","load_duration",
-                                   "prompt_eval_count","prompt_eval_duration",
-                                   "eval_count","eval_duration")}
+    return prompt
+
+_META_KEYS = ("created_at","total_duration","load_duration",
+              "prompt_eval_count","prompt_eval_duration",
+              "eval_count","eval_duration")
+
+def _log_timing(meta: dict, t0: float, ttft: float|None=None) -> None:
     if os.getenv("NOVA_TIMINGS","0")=="1":
         pe, ge = meta.get("prompt_eval_duration"), meta.get("eval_duration")
         pec, gec = meta.get("prompt_eval_count"), meta.get("eval_count")
         ptps = (pec/pe*1e9) if (pec and pe) else None
         gtps = (gec/ge*1e9) if (gec and ge) else None
         extra = (f" prompt_tps~{ptps:.1f}" if ptps else "") + (f" gen_tps~{gtps:.1f}" if gtps else "")
+        if meta.get("prompt_eval_saved"):
+            extra += f" prefix_saved~{meta['prompt_eval_saved']}tok"
+        if ttft is not None:
+            extra = f" ttft={ttft:.2f}s" + extra
         timing(f"[model] total={time.perf_counter()-t0:.2f}s{extra}")
-    diag("[router] run_ollama_chat ok")
+
+# "chat" talks to /api/chat with structured messages so Ollama can reuse the KV cache
+# for an unchanged system prefix; "generate" keeps the legacy flattened [SYS]/[USER] prompt.
+OLLAMA_API = os.getenv("NOVA_OLLAMA_API", "chat").strip().lower()
+
+def _use_chat() -> bool:
+    return OLLAMA_API != "generate"
+
+def _payload(messages: List[Dict[str,str]], model: str, options: dict|None) -> dict:
+    if _use_chat():
+        msgs = [{"role": (m.get("role") if m.get("role") in ("system","user","assistant") else "user"),
+                 "content": m.get("content") or ""} for m in messages]
+        payload = {"model": model, "messages": msgs, "stream": False}
+    else:
+        payload = {"model": model, "prompt": _flatten(messages), "stream": False}
+    if options:
+        payload["options"] = options
+    payload["keep_alive"] = KEEPWARM.KEEP_ALIVE  # otherwise each request resets Ollama to its 5m default
+    KEEPWARM.touch(model)
+    return payload
+
+def _endpoint() -> str:
+    return "/api/chat" if _use_chat() else "/api/generate"
+
+def _piece(obj: dict) -> str:
+    if "message" in obj:
+        return (obj.get("message") or {}).get("content") or ""
+    return obj.get("response") or ""
+
+# ---- prompt-prefix reuse accounting ----
+# Ollama reports prompt_eval_count as the tokens it actually had to evaluate, so a
+# cached system prefix shows up as a lower count than the prompt's size. The prefix
+# is the persona/rules block (the first system message), which stays byte-identical
+# across questions. Per (model, prefix) we learn the highest ratio of evaluated tokens
+# to estimated prompt tokens (a cold evaluation of the whole prompt), then report how
+# far a later call - any question - fell below that expectation, capped at the
+# prefix's own size. A prefix seen for the first time, or a call that evaluated
+# everything, reports 0.
+_PREFIX_COLD: "OrderedDict[Tuple[str,str], float]" = OrderedDict()
+_PREFIX_COLD_MAX = 256
+_PREFIX_LOCK = threading.Lock()
+
+def _lead(messages: List[Dict[str,str]]) -> str:
+    return next((m.get("content") or "" for m in messages[:1] if m.get("role") == "system"), "")
+
+def _prefix_hash(messages: List[Dict[str,str]]) -> str:
+    return hashlib.sha1(_lead(messages).encode("utf-8")).hexdigest()[:12]
+
+def _prefix_meta(messages: List[Dict[str,str]], model: str, meta: dict) -> None:
+    meta["prompt_prefix"] = _prefix_hash(messages)
+    pec = meta.get("prompt_eval_count")
+    if not pec:
+        return
+    total = sum(approx_tokens(m.get("content") or "") for m in messages) or 1
+    key = (model, meta["prompt_prefix"])
+    with _PREFIX_LOCK:
+        cold = _PREFIX_COLD.get(key, 0.0)
+        _PREFIX_COLD[key] = max(cold, int(pec) / total)
+        _PREFIX_COLD.move_to_end(key)
+        while len(_PREFIX_COLD) > _PREFIX_COLD_MAX:
+            _PREFIX_COLD.popitem(last=False)
+    saved = int(max(0.0, min(cold * approx_tokens(_lead(messages)), cold * total - int(pec))))
+    meta["prompt_eval_saved"] = saved
+    meta["prefix_reused"] = saved > 0
+
+def iter_ollama_chat(messages: List[Dict[str,str]], *, model: str, options: dict|None=None) -> Iterator[dict]:
+    """Raw streaming API: yields Ollama's NDJSON chunks (``message``/``response``, ``done``, …) as they arrive."""
+    return _post_stream(_endpoint(), _payload(messages, model, options))
+
+def stream_ollama_chat(messages: List[Dict[str,str]], *, model: str, options: dict|None=None,
+                       meta: dict|None=None, priority: str="interactive",
+                       deadline_s: float|None=None, stop: threading.Event|None=None) -> Iterator[str]:
+    """
+    Yield text pieces as the model produces them.
+    Timing fields from the final chunk are written into `meta` (if given) once the stream ends.
+    The model slot is held from the first next() until the stream ends or is closed.
+    `stop` (see the scheduler notes) is for the caller to check between pieces.
+    """
+    with _SCHED.slot(model, priority, deadline_s, stop):
+        yield from _stream_pieces(messages, model, options, meta)
+
+def _stream_pieces(messages, model, options, meta) -> Iterator[str]:
+    t0 = time.perf_counter()
+    ttft = None
+    for chunk in iter_ollama_chat(messages, model=model, options=options):
+        piece = _piece(chunk)
+        if piece:
+            if ttft is None:
+                ttft = time.perf_counter() - t0
+            yield piece
+        if chunk.get("done"):
+            info = {k: chunk.get(k) for k in _META_KEYS}
+            info["ttft_ms"] = int((ttft or 0.0) * 1000)
+            _prefix_meta(messages, model, info)
+            if meta is not None:
+                meta.update(info)
+            _log_timing(info, t0, ttft)
+    diag(f"[router] stream_ollama_chat ok pool={pool_stats()}")
+
+def run_ollama_chat(messages: List[Dict[str,str]], *, model: str, stream: bool=False, options: dict|None=None,
+                    priority: str="interactive", deadline_s: float|None=None) -> Tuple[str, dict]:
+    """Blocking chat call. `priority` picks the scheduler lane (interactive | web | background);
+    raises SchedulerBusy if the job cannot start within `deadline_s` (lane default if None)."""
+    if stream:
+        meta: dict = {}
+        text = "".join(stream_ollama_chat(messages, model=model, options=options, meta=meta,
+                                          priority=priority, deadline_s=deadline_s)).strip()
+        return text, meta
+    t0 = time.perf_counter()
+    with _SCHED.slot(model, priority, deadline_s):
+        res = _post(_endpoint(), _payload(messages, model, options))
+    text = _piece(res).strip()
+    meta = {k:res.get(k) for k in _META_KEYS}
+    _prefix_meta(messages, model, meta)
+    _log_timing(meta, t0)
+    diag(f"[router] run_ollama_chat ok pool={pool_stats()}")
     return text, meta or {}
 
 
+EMBED_MODEL = os.getenv("NOVA_EMBED_MODEL", "nomic-embed-text")
+
+def embed(text: str, *, model: str|None=None, priority: str="interactive") -> List[float]:
+    """Embedding vector for `text` via Ollama /api/embeddings (same keep-alive pool), in a scheduler slot."""
+    model = model or EMBED_MODEL
+    with _SCHED.slot(model, priority):
+        res = _post("/api/embeddings", {"model": model, "prompt": text or ""})
+    vec = res.get("embedding") or []
+    if not vec:
+        raise RuntimeError("ollama: empty embedding")
+    return vec
+
+
 def build_prompt(messages):
     """Very small prompt builder: turn a chat list into a plain prompt for /api/generate."""
     lines = []
@@ -147,7 +444,8 @@ def build_prompt(messages):
     lines.append("Assistant:")
     return "\n".join(lines)
 
-__all__ = ["skill_first", "run_ollama_chat", "route_message"]
+__all__ = ["skill_first", "run_ollama_chat", "stream_ollama_chat", "iter_ollama_chat", "pool_stats", "embed", "skill_stats", "route_message",
+           "SchedulerBusy", "scheduler_stats"]
 
 # export alias expected by orchestrator
 skill_router = skill_first
@@ -1,14 +1,24 @@
 from __future__ import annotations
 import json
-import urllib.request
 # nova/core/skills/forex.py
 import os
 import re
 from typing import Optional, Tuple
 from .. import web_fetcher as WEB  # uses your existing web summarizer
+from .. import net as NET
 
 _TRUE = {"1","true","yes","on"}
 
+NAME = "fxx"
+
+# Only allow valid ISO-like currency codes (prevents catching "GiB → MiB", etc.)
+_CODES = {
+    "USD","EUR","GBP","JPY","AUD","CAD","CHF","CNY","INR","MXN","BRL","KRW",
+    "SEK","NOK","NZD","ZAR","RUB","HKD","SGD","TRY"
+}
+# router prefilter: a currency code not glued to other letters ("100usd" still counts)
+TRIGGER = r"(?<![a-z])(?:" + "|".join(sorted(_CODES)) + r")(?![a-z])"
+
 _TICKER_RE = re.compile(r'\b(?:price|quote)\s+([A-Za-z.\-]{1,10})\b', re.I)
 _CCY_PAIR_RE = re.compile(r'\b([A-Za-z]{3})\s*/\s*([A-Za-z]{3})\b', re.I)
 _CCY_CONV_RE = re.compile(r'\b(\d+(?:\.\d+)?)\s*([A-Za-z]{3})\s+(?:to|in|→|->)\s*([A-Za-z]{3})\b', re.I)
@@ -62,11 +72,7 @@ def try_fxx(q: str) -> str | None:
     if any(tok in ql for tok in ("weather", "forecast", "time", "date", "hello", "hi")):
         return None
 
-    # Only allow valid ISO-like currency codes (prevents catching "GiB → MiB", etc.)
-    CODES = {
-        "USD","EUR","GBP","JPY","AUD","CAD","CHF","CNY","INR","MXN","BRL","KRW",
-        "SEK","NOK","NZD","ZAR","RUB","HKD","SGD","TRY"
-    }
+    CODES = _CODES
 
     # amount + code + (to|in|->|→) + code
     m = re.search(
@@ -129,8 +135,7 @@ def _fx_live(amount: float, src: str, dst: str, timeout: float = 1.5):
         return None
     try:
         url = f"https://api.frankfurter.app/latest?amount={amount}&from={src.upper()}&to={dst.upper()}"
-        with urllib.request.urlopen(url, timeout=timeout) as r:
-            data = json.loads(r.read().decode('utf-8', 'ignore') or "{}")
+        data = json.loads(NET.get(url, timeout=timeout).decode('utf-8', 'ignore') or "{}")
         rates = (data.get('rates') or {})
         val = rates.get(dst.upper())
         if val is None:
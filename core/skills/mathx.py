@@ -4,6 +4,8 @@ import ast, math, operator
 from typing import Optional
 
 NAME = "mathx"
+# router prefilter: _looks_math needs at least one operator/paren/point
+TRIGGER = r"[-+*/^().]"
 
 # Allowed names and functions
 _ALLOWED_NAMES = {
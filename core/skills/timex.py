@@ -5,6 +5,8 @@ import re
 from typing import Optional
 
 NAME = "timex"
+# router prefilter: one of the keywords every pattern below contains
+TRIGGER = r"\b(?:days?|time|date|add)\b"
 
 # Basic patterns: "days until YYYY-MM-DD", "what day is 2025-10-21", "add 2h 30m to 14:10"
 _RX_UNTIL = re.compile(r"^\s*days?\s+until\s+(\d{4}-\d{2}-\d{2})\s*$", re.I)
@@ -4,6 +4,8 @@ import re
 from typing import Optional, Tuple
 
 NAME = "units"
+# router prefilter: every conversion starts with a number
+TRIGGER = r"\d"
 
 # ---------- Canonical maps ----------
 # Length (base: meter)
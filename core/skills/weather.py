@@ -7,9 +7,12 @@ from typing import Optional
 from .. import web_fetcher as WEB
 
 # Fallback: direct HTTP to wttr.in (simple JSON)
-import json, urllib.request, urllib.parse
+import json, urllib.parse
+from .. import net as NET
 
 NAME = "weather"
+# router prefilter
+TRIGGER = r"\b(?:weather|forecast)\b"
 
 _RX_QUERY = re.compile(
     r"^\s*(?:what(?:'s| is)\s+)?(?:the\s+)?(weather|forecast)\s+(?:in|for|at)\s+(?P<place>.+?)\s*\??\s*$",
@@ -26,10 +29,10 @@ def _wttr_fetch(place: str, *, timeout: int = 8) -> Optional[str]:
     Fallback: query wttr.in JSON and format concise bullets.
     """
     url = f"https://wttr.in/{urllib.parse.quote(place)}?format=j1"
-    req = urllib.request.Request(url, headers={"User-Agent": "nova-weather/1.0"})
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as r:
-            data = json.loads(r.read().decode("utf-8", "ignore"))
+        # rate-limited + circuit-broken: a dead wttr.in fails fast instead of costing `timeout`
+        body = NET.get(url, timeout=timeout, headers={"User-Agent": "nova-weather/1.0"})
+        data = json.loads(body.decode("utf-8", "ignore"))
     except Exception:
         return None
 
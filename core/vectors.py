@@ -0,0 +1,326 @@
+# nova/core/vectors.py
+from __future__ import annotations
+import json, os, threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import fcntl  # POSIX: serializes writers across processes (server + REPL)
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+
+# numpy is optional (vector features switch off without it) and imported on first
+# use: the semantic cache is off by default, so a CLI start shouldn't pay for it.
+np = None
+
+def _numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+            np = numpy
+        except Exception:
+            pass
+    return np
+
+# Above this many rows, search first scores a small random projection held in RAM
+# and re-ranks only the best candidates against the full mmap'd vectors.
+_COARSE_FROM = int(os.getenv("NOVA_VEC_COARSE_FROM", "20000"))
+_COARSE_DIM = 64
+_COARSE_TOP = 32
+
+def available() -> bool:
+    if np is not None:
+        return True
+    import importlib.util
+    return importlib.util.find_spec("numpy") is not None
+
+_MAGIC = b"NVF1"
+_HDR = 16            # magic + uint32 dim + reserved; rows follow
+_TAIL_MAX = 8192     # rows appended since the last remap are kept in RAM up to this
+
+class VectorStore:
+    """
+    Append-only float32 matrix on disk (`<base>.f32`: 16-byte header with the
+    dimension, then rows; memory-mapped for search) plus one JSON line of metadata per
+    row (`<base>.jsonl`). Rows are L2-normalized on add, so a single matrix-vector
+    product gives cosine similarity. Each row has a `group` string; search is
+    restricted to one group and rows can be dropped per group.
+    Rows added in this process also go to an in-RAM tail and extend the group/alive
+    arrays and the coarse matrix in place, so an add never forces a full remap.
+    Several processes may share a store: writes happen under an flock on
+    `<base>.lock`, and a reader reloads when either file's size/mtime changed.
+    """
+    def __init__(self, base: Path):
+        self.base = Path(base)
+        self._f32 = self.base.with_suffix(".f32")
+        self._meta_path = self.base.with_suffix(".jsonl")
+        self._lock_path = self.base.with_suffix(".lock")
+        self._lock = threading.Lock()
+        self._meta: List[Dict] = []
+        self._mat = None          # np.memmap (n_map, dim): rows on disk at the last remap
+        self._n_map = 0
+        self._tail = None         # (cap, dim) rows added since, first _n_tail in use
+        self._n_tail = 0
+        self._dim = 0
+        self._off = _HDR          # byte offset of row 0 (0 for headerless files)
+        self._alive = None        # bool mask
+        self._group_ids = None    # int per row
+        self._groups: Dict[str, int] = {}
+        self._masks: Dict[str, object] = {}  # group -> cached live-row mask
+        self._proj = None         # (dim, _COARSE_DIM) random projection
+        self._coarse = None       # (cap, _COARSE_DIM) in RAM, first len(meta) rows in use
+        self._seen = None         # _stamp() of the files as last loaded/written
+        self._stale = False       # tail is full: remap before the next search
+
+    # ---- loading ----
+    def _stamp(self) -> Tuple[int, ...]:
+        out: List[int] = []
+        for p in (self._f32, self._meta_path):
+            try:
+                st = p.stat()
+                out += [st.st_size, st.st_mtime_ns]
+            except FileNotFoundError:
+                out += [0, 0]
+        return tuple(out)
+
+    @contextmanager
+    def _flock(self):
+        """Exclusive lock shared with other processes on this store (no-op without fcntl). Not re-entrant."""
+        if fcntl is None:
+            yield
+            return
+        self.base.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refresh(self, locked: bool = False) -> None:
+        """Bring the in-memory view up to date with the files (caller holds self._lock)."""
+        st = self._stamp()
+        if st != self._seen:
+            if locked or not any(st):  # no files yet: nothing to lock against
+                self._reload()
+            else:
+                with self._flock():
+                    self._reload()
+        elif self._stale:
+            self._remap()
+
+    def _reload(self) -> None:
+        """
+        Re-read both files (caller holds the flock). A crash between the two appends of
+        a row leaves one file longer; both are cut back to the rows they have in common
+        so the next append can't pair a vector with another row's metadata.
+        """
+        meta: List[Dict] = []
+        lines = 0
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                for ln in f:
+                    if not ln.strip():
+                        continue
+                    lines += 1
+                    try:
+                        meta.append(json.loads(ln))
+                    except ValueError:
+                        break  # torn last line
+        except FileNotFoundError:
+            pass
+        self._meta = meta
+        self._remap()
+        n = len(self._meta)
+        if lines > n:
+            self._rewrite_meta()
+        want = self._off + n * self._dim * 4 if n else 0
+        if self._f32.exists() and self._f32.stat().st_size > want:
+            self._mat = None  # drop the map before cutting the file under it
+            os.truncate(self._f32, want)
+            self._remap()
+        self._seen = self._stamp()
+
+    def _rewrite_meta(self) -> None:
+        tmp = self._meta_path.with_suffix(".jsonl.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for m in self._meta:
+                f.write(json.dumps(m, ensure_ascii=False) + "\n")
+        os.replace(tmp, self._meta_path)
+
+    def _header(self, size: int) -> Tuple[int, int]:
+        """(row offset, dim) of the file on disk; (_HDR, 0) when there is none yet."""
+        if size >= _HDR:
+            with open(self._f32, "rb") as f:
+                head = f.read(_HDR)
+            if head[:4] == _MAGIC:
+                return _HDR, int.from_bytes(head[4:8], "little")
+        n = len(self._meta)
+        if size and n:
+            return 0, size // 4 // n  # headerless file from before the header existed
+        return _HDR, 0
+
+    def _remap(self) -> None:
+        self._stale = False
+        size = self._f32.stat().st_size if self._f32.exists() else 0
+        self._off, self._dim = self._header(size)
+        n = min(len(self._meta), (size - self._off) // 4 // self._dim) if self._dim else 0
+        self._meta = self._meta[:n]
+        self._mat = (np.memmap(self._f32, dtype=np.float32, mode="r", offset=self._off, shape=(n, self._dim))
+                     if n else None)
+        self._n_map, self._tail, self._n_tail = n, None, 0
+        self._groups = {}
+        self._group_ids = np.array([self._groups.setdefault(m.get("group", ""), len(self._groups))
+                                    for m in self._meta], dtype=np.int32)
+        self._alive = np.array([not m.get("dead") for m in self._meta], dtype=bool)
+        self._masks = {}
+        self._coarse = None
+
+    def _coarse_matrix(self):
+        n = len(self._meta)
+        if self._coarse is None and self._mat is not None and n >= _COARSE_FROM:
+            rng = np.random.default_rng(0)
+            self._proj = (rng.standard_normal((self._dim, _COARSE_DIM)) / np.sqrt(_COARSE_DIM)).astype(np.float32)
+            self._coarse = np.empty((n + _TAIL_MAX, _COARSE_DIM), dtype=np.float32)
+            self._coarse[:self._n_map] = self._mat @ self._proj
+            if self._n_tail:
+                self._coarse[self._n_map:n] = self._tail[:self._n_tail] @ self._proj
+        return None if self._coarse is None else self._coarse[:n]
+
+    def _append_row(self, v, meta: Dict) -> None:
+        """Extend the in-memory search state by one row (the file append is done)."""
+        if self._tail is None:
+            self._tail = np.empty((64, self._dim), dtype=np.float32)
+        elif self._n_tail == len(self._tail):
+            self._tail = np.concatenate([self._tail, np.empty_like(self._tail)])
+        self._tail[self._n_tail] = v
+        self._n_tail += 1
+        gid = self._groups.setdefault(meta.get("group", ""), len(self._groups))
+        self._group_ids = np.append(self._group_ids, np.int32(gid))
+        self._alive = np.append(self._alive, not meta.get("dead"))
+        for g, mask in self._masks.items():
+            self._masks[g] = np.append(mask, self._groups[g] == gid and not meta.get("dead"))
+        if self._coarse is not None:
+            n = len(self._meta)  # meta already holds the new row
+            if n > len(self._coarse):
+                self._coarse = np.concatenate([self._coarse, np.empty_like(self._coarse)])
+            self._coarse[n - 1] = v @ self._proj
+        if self._n_tail >= _TAIL_MAX:
+            self._stale = True  # fold the tail into the memmap at the next search
+
+    def _rows(self, idx):
+        """Vectors for row indices (memmap part and RAM tail)."""
+        if not self._n_tail:
+            return self._mat[idx]
+        out = np.empty((len(idx), self._dim), dtype=np.float32)
+        on_disk = idx < self._n_map
+        if on_disk.any():
+            out[on_disk] = self._mat[idx[on_disk]]
+        out[~on_disk] = self._tail[idx[~on_disk] - self._n_map]
+        return out
+
+    def _all_scores(self, v):
+        parts = []
+        if self._mat is not None:
+            parts.append(np.asarray(self._mat @ v))
+        if self._n_tail:
+            parts.append(self._tail[:self._n_tail] @ v)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    # ---- public ----
+    def __len__(self) -> int:
+        if not any(self._stamp()) or _numpy() is None:
+            return 0
+        with self._lock:
+            self._refresh()
+            return len(self._meta)
+
+    def add(self, vec: Sequence[float], meta: Dict) -> int:
+        """Append one vector; returns its row (or -1 if numpy is missing / dims don't match)."""
+        if _numpy() is None:
+            return -1
+        v = np.asarray(vec, dtype=np.float32).ravel()
+        nrm = float(np.linalg.norm(v))
+        if not v.size or nrm == 0.0:
+            return -1
+        v /= nrm
+        with self._lock, self._flock():
+            # both appends happen under the flock, so rows stay paired across processes
+            self._refresh(locked=True)
+            if self._dim and v.size != self._dim:
+                return -1
+            self.base.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._f32, "ab") as f:
+                if f.tell() == 0:
+                    f.write(_MAGIC + int(v.size).to_bytes(4, "little") + bytes(_HDR - 8))
+                    self._off = _HDR
+                f.write(v.tobytes())
+            with open(self._meta_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(meta, ensure_ascii=False) + "\n")
+            self._dim = int(v.size)
+            self._meta.append(meta)
+            self._append_row(v, meta)
+            self._seen = self._stamp()
+            return len(self._meta) - 1
+
+    def search(self, vec: Sequence[float], *, group: str, k: int = 1) -> List[Tuple[float, int, Dict]]:
+        """Top-k (cosine, row, meta) among live rows of `group`, best first."""
+        if _numpy() is None:
+            return []
+        with self._lock:
+            self._refresh()
+            if not self._meta or group not in self._groups:
+                return []
+            v = np.asarray(vec, dtype=np.float32).ravel()
+            if v.size != self._dim:
+                return []
+            v = v / (float(np.linalg.norm(v)) or 1.0)
+            mask = self._masks.get(group)
+            if mask is None:
+                mask = self._masks[group] = self._alive & (self._group_ids == self._groups[group])
+            coarse = self._coarse_matrix()
+            if coarse is not None:
+                cs = coarse @ (v @ self._proj)
+                cs[~mask] = -np.inf
+                top = min(len(cs), max(k, _COARSE_TOP))
+                cand = np.argpartition(-cs, top - 1)[:top]
+                cand = cand[mask[cand]]
+                scores = np.asarray(self._rows(cand) @ v)
+                order = np.argsort(-scores)[:k]
+                return [(float(scores[i]), int(cand[i]), self._meta[int(cand[i])]) for i in order]
+            scores = self._all_scores(v)
+            scores[~mask] = -np.inf
+            k = min(k, int(mask.sum()))
+            if k <= 0:
+                return []
+            idx = np.argpartition(-scores, k - 1)[:k]
+            idx = idx[np.argsort(-scores[idx])]
+            return [(float(scores[i]), int(i), self._meta[int(i)]) for i in idx]
+
+    def drop(self, pred) -> int:
+        """Tombstone rows whose meta matches pred(meta); rewrites the metadata file."""
+        if not any(self._stamp()) or _numpy() is None:
+            return 0
+        with self._lock, self._flock():
+            self._refresh(locked=True)
+            n = 0
+            for i, m in enumerate(self._meta):
+                if not m.get("dead") and pred(m):
+                    m["dead"] = True
+                    n += 1
+                    self._alive[i] = False
+                    for mask in self._masks.values():
+                        mask[i] = False
+            if n:
+                self._rewrite_meta()
+                self._seen = self._stamp()
+            return n
+
+    def clear(self) -> None:
+        with self._lock, self._flock():
+            for p in (self._f32, self._meta_path):
+                try: p.unlink()
+                except FileNotFoundError: pass
+            self._meta, self._mat, self._tail, self._n_tail, self._seen = [], None, None, 0, None
@@ -0,0 +1,257 @@
+# nova/core/web_async.py
+from __future__ import annotations
+import asyncio, os, ssl, time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from ..cache import web as WCACHE
+from . import net as NET
+from . import web_fetcher as WF
+
+# asyncio variant of web_fetcher.search_and_summarize (enable with NOVA_WEB_ASYNC=1):
+#  - both DDG endpoints are queried at once;
+#  - result pages start downloading as soon as either engine answers;
+#  - synthesis starts once WEB_MAXDOCS readable docs are in, every fetch has settled,
+#    or the fetch share of the budget is spent;
+#  - the whole thing has one hard deadline (NOVA_WEB_ASYNC_DEADLINE).
+# Network I/O goes through a pluggable transport (default: asyncio streams, HTTP/1.1);
+# set_transport() swaps it, e.g. for a fake in tests. Page bodies share the on-disk
+# cache (cache/web.py) with the blocking path.
+WEB_ASYNC_DEADLINE_S = float(os.getenv("NOVA_WEB_ASYNC_DEADLINE", "20"))
+_FETCH_SHARE = 0.5          # of the deadline, reserved for search + fetch; the rest is synthesis
+_MAX_BODY = 4 * 1024 * 1024
+_REDIRECTS = 4
+
+Transport = Callable[[str, float, Dict[str, str]], Awaitable[Tuple[int, bytes, Dict[str, str]]]]
+
+# ---------- default transport: plain asyncio streams ----------
+async def _read_body(reader: asyncio.StreamReader, hdrs: Dict[str, str]) -> bytes:
+    if "chunked" in hdrs.get("transfer-encoding", "").lower():
+        out = bytearray()
+        while len(out) < _MAX_BODY:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                break
+            out += await reader.readexactly(size)
+            await reader.readline()
+        return bytes(out)
+    if "content-length" in hdrs:
+        return await reader.readexactly(min(int(hdrs["content-length"]), _MAX_BODY))
+    # close-delimited: read() only returns what is buffered, so loop until EOF
+    out = bytearray()
+    while len(out) < _MAX_BODY:
+        chunk = await reader.read(_MAX_BODY - len(out))
+        if not chunk:
+            break
+        out += chunk
+    return bytes(out)
+
+async def stream_transport(url: str, timeout: float, headers: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+    """GET `url` (follows redirects); returns (status, body, lower-cased headers)."""
+    async def once(u: str):
+        p = urlsplit(u)
+        https = p.scheme == "https"
+        reader, writer = await asyncio.open_connection(
+            p.hostname, p.port or (443 if https else 80),
+            ssl=ssl.create_default_context() if https else None)
+        try:
+            path = (p.path or "/") + (f"?{p.query}" if p.query else "")
+            req = {"Host": p.netloc, "User-Agent": WF.UA, "Accept": "*/*",
+                   "Accept-Language": "en-US,en;q=0.9", "Accept-Encoding": "identity",
+                   "Connection": "close", **headers}
+            writer.write((f"GET {path} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in req.items())
+                          + "\r\n").encode("latin-1"))
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            hdrs: Dict[str, str] = {}
+            while True:
+                ln = await reader.readline()
+                if ln in (b"\r\n", b"\n", b""):
+                    break
+                k, _, v = ln.decode("latin-1").partition(":")
+                hdrs[k.strip().lower()] = v.strip()
+            body = b"" if status in (204, 304) else await _read_body(reader, hdrs)
+            return status, body, hdrs
+        finally:
+            writer.close()
+
+    async def follow():
+        u = url
+        for _ in range(_REDIRECTS + 1):
+            status, body, hdrs = await once(u)
+            if status in (301, 302, 303, 307, 308) and hdrs.get("location"):
+                u = urljoin(u, hdrs["location"])
+                continue
+            return status, body, hdrs
+        raise RuntimeError(f"too many redirects: {url}")
+
+    return await asyncio.wait_for(follow(), timeout)
+
+_TRANSPORT: Transport = stream_transport
+
+def set_transport(fn: Optional[Transport]) -> None:
+    """Swap the HTTP transport (None → asyncio streams)."""
+    global _TRANSPORT
+    _TRANSPORT = fn or stream_transport
+
+async def _guarded(url: str, timeout: float, headers: Dict[str, str]):
+    """_TRANSPORT behind core/net.py's per-host rate limit and circuit breaker."""
+    wait = NET.admit(url, timeout)
+    if wait:
+        await asyncio.sleep(wait)
+    t0 = time.perf_counter()
+    try:
+        res = await _TRANSPORT(url, max(0.1, timeout - wait), headers)
+    except asyncio.CancelledError:
+        NET.record(url, None)  # the pipeline moved on; not the host's fault
+        raise
+    except BaseException:
+        NET.record(url, False, (time.perf_counter() - t0) * 1000)
+        raise
+    NET.record(url, not NET._failed_status(res[0]), (time.perf_counter() - t0) * 1000)
+    return res
+
+async def cached_get(url: str, transform, timeout: float = WF.WEB_TIMEOUT_S, keep=None) -> str:
+    """Async twin of web_fetcher._cached_get: fresh cache hit, 304 revalidation, stale-on-error."""
+    ent = WCACHE.lookup(url)
+    if ent and ent.get("fresh"):
+        return ent.get("body") or ""
+    try:
+        status, b, hdrs = await _guarded(url, timeout, WCACHE.validators(ent))
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status}: {url}")
+    except Exception:
+        if ent:
+            return ent.get("body") or ""
+        raise
+    if status == 304 and ent:
+        return WCACHE.revalidated(url, ent)
+    out = await asyncio.to_thread(transform, b, content_type=hdrs.get("content-type"))
+    if keep is not None and not keep(out):
+        return (ent.get("body") or "") if ent else out
+    WCACHE.put(url, out, etag=hdrs.get("etag"), last_modified=hdrs.get("last-modified"))
+    return out
+
+# ---------- pipeline ----------
+async def _engine(base: str, parse, query: str, k: int, timeout: float) -> List[Tuple[str, str]]:
+    try:
+        return parse(await cached_get(WF.ddg_url(base, query), WF._decode, timeout, WF.serp_keep(parse)), k)
+    except Exception:
+        return []
+
+async def _fetch(url: str, timeout: float) -> str:
+    try:
+        return await cached_get(url, WF._clean_bytes, timeout)
+    except Exception:
+        return ""
+
+async def gather_docs(query: str, *, want: int = WF.WEB_MAXDOCS,
+                      links: Optional[List[Tuple[str, str]]] = None,
+                      deadline_s: float = WEB_ASYNC_DEADLINE_S * _FETCH_SHARE) -> Tuple[List[Tuple[str, str, str]], List[str]]:
+    """
+    Search both engines concurrently and fetch result pages as links arrive.
+    Returns ((title, url, text) docs in rank order, every candidate url in rank order).
+    Rank = fastpath order, or html results ahead of lite results. Known search results
+    (`links`, e.g. from the search cache) skip the engines.
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline_s
+    per_req = max(1.0, min(float(WF.WEB_TIMEOUT_S), deadline_s))
+    sem = asyncio.Semaphore(max(1, WF.WEB_FETCH_WORKERS))
+    rank: Dict[str, Tuple[int, int]] = {}   # url -> (source, position); lower ranks first
+    titles: Dict[str, str] = {}
+    texts: Dict[str, str] = {}
+    fetches: Dict[asyncio.Task, str] = {}
+
+    async def fetch_limited(u: str) -> str:
+        async with sem:
+            return await _fetch(u, per_req)
+
+    def add_links(src: int, pairs: List[Tuple[str, str]]) -> None:
+        for pos, (title, url) in enumerate(pairs):
+            if url in rank:
+                if (src, pos) < rank[url]:
+                    rank[url], titles[url] = (src, pos), title
+                continue
+            if len(rank) >= want * 2:
+                continue
+            rank[url] = (src, pos)
+            titles[url] = title
+            fetches[asyncio.ensure_future(fetch_limited(url))] = url
+
+    fast = WF._fastpath_urls(query)
+    engines: Dict[asyncio.Task, int] = {}
+    if fast:
+        add_links(0, [(u, u) for u in fast[:want]])
+    elif links is not None:
+        add_links(0, links)
+    else:
+        # whichever engine answers first starts the fetches; html still ranks ahead of lite
+        engines[asyncio.ensure_future(_engine(WF.DDG_HTML_URL, WF.parse_ddg_html, query, want, per_req))] = 0
+        engines[asyncio.ensure_future(_engine(WF.DDG_LITE_URL, WF.parse_ddg_lite, query, want, per_req))] = 1
+
+    ran_engines = bool(engines)
+    try:
+        # done when `want` docs are in and no better-ranked engine is still out, or on deadline
+        while (engines or fetches) and not (len(texts) >= want and 0 not in engines.values()):
+            left = end - loop.time()
+            if left <= 0:
+                break
+            done, _ = await asyncio.wait(set(engines) | set(fetches), timeout=left,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for t in done:
+                if t in engines:
+                    add_links(engines.pop(t), t.result())
+                else:
+                    url = fetches.pop(t)
+                    if t.result():
+                        texts[url] = t.result()
+    finally:
+        for t in list(engines) + list(fetches):
+            t.cancel()
+
+    order = sorted(rank, key=rank.get)
+    if ran_engines and 0 not in engines.values():  # html engine answered: remember the ranking
+        WF.store_search(query, want, [(titles[u], u) for u in order][:want])
+    docs = [(titles[u] or WF._extract_title(texts[u]) or u, u, texts[u]) for u in order if u in texts][:want]
+    return docs, order
+
+async def search_and_summarize(query: str, *, budget_tokens: int = 800,
+                               deadline_s: float = WEB_ASYNC_DEADLINE_S, stop=None) -> Tuple[str, Dict]:
+    """Same contract as web_fetcher.search_and_summarize, under one end-to-end deadline."""
+    t0 = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline_s
+    fast = bool(WF._fastpath_urls(query))
+    links = None if fast else WF.cached_search(query, WF.WEB_MAXDOCS)
+    docs, urls = await gather_docs(query, links=links, deadline_s=deadline_s * _FETCH_SHARE)
+    WF._tlog("search+fetch", t0, "" if fast else WF._cache_note(links is not None))
+    if not docs:
+        return "", {"web_used": False, "links": urls}
+    if stop is not None and stop.is_set():
+        return "", {"web_used": False, "links": [d[1] for d in docs], "reason": "cancelled"}
+    s0 = time.perf_counter()
+    try:
+        # the model call itself is blocking; past the deadline its answer is discarded
+        ans, meta = await asyncio.wait_for(
+            asyncio.to_thread(WF.synthesize_answer, docs, query, budget_tokens=budget_tokens),
+            max(0.1, end - loop.time()))
+    except asyncio.TimeoutError:
+        return "", {"web_used": False, "links": [d[1] for d in docs], "reason": "deadline"}
+    WF._tlog("synth", s0)
+    if (ans or "").strip() == "(no web results)":
+        return "", {"web_used": False, "links": [d[1] for d in docs], "reason": "no_useful_extracts"}
+    return ans, meta
+
+def run(query: str, *, budget_tokens: int = 800, deadline_s: float = WEB_ASYNC_DEADLINE_S,
+        stop=None) -> Tuple[str, Dict]:
+    """Blocking entry point (for callers without an event loop of their own)."""
+    # not asyncio.run(): that would wait for a synthesis thread we already gave up on
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(
+            search_and_summarize(query, budget_tokens=budget_tokens, deadline_s=deadline_s, stop=stop))
+    finally:
+        loop.close()
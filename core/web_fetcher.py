@@ -4,11 +4,18 @@ from __future__ import annotations
 import os
 import re
 import time
-import json
 import html
-import urllib.request
+import codecs
+import math
+from html.parser import HTMLParser
 import urllib.parse
-from typing import List, Tuple, Dict, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as _FutTimeout
+from typing import List, Tuple, Dict, Optional, Sequence
+
+from ..cache import web as WCACHE
+from ..cache.store import LRUCache
+from . import net as NET
 
 # ---------- configuration ----------
 UA = os.getenv(
@@ -17,54 +24,201 @@ UA = os.getenv(
 )
 WEB_TIMEOUT_S = int(os.getenv("NOVA_WEB_TIMEOUT", "30"))
 WEB_MAXDOCS   = int(os.getenv("NOVA_WEB_MAXDOCS", "6"))
+# parallel fetch stage: worker count and one overall deadline for all documents
+WEB_FETCH_WORKERS = int(os.getenv("NOVA_WEB_FETCH_WORKERS", str(WEB_MAXDOCS)))
+WEB_FETCH_DEADLINE_S = float(os.getenv("NOVA_WEB_FETCH_DEADLINE", "10"))
+# search endpoints (overridable, e.g. to point tests at a local fake server)
+DDG_HTML_URL = os.getenv("NOVA_DDG_HTML_URL", "https://html.duckduckgo.com/html/")
+DDG_LITE_URL = os.getenv("NOVA_DDG_LITE_URL", "https://duckduckgo.com/lite/")
+# NOVA_WEB_ASYNC=1: search_and_summarize runs the asyncio pipeline in core/web_async.py
+WEB_ASYNC = os.getenv("NOVA_WEB_ASYNC", "0").lower() in ("1", "true", "yes", "on")
+# text kept per fetched page; the extractor stops parsing once it has this much
+WEB_PAGE_CHARS = int(os.getenv("NOVA_WEB_PAGE_CHARS", "40000"))
+# synthesis sees only the best-matching passages (BM25 against the query), ~this long each
+WEB_PASSAGE_CHARS = int(os.getenv("NOVA_WEB_PASSAGE_CHARS", "500"))
+
+# search results ((title, url) lists) are kept in memory per normalized query
+SEARCH_CACHE_TTL_S = float(os.getenv("NOVA_SEARCH_CACHE_TTL", "600"))
+_SEARCH_CACHE = LRUCache(max_entries=int(os.getenv("NOVA_SEARCH_CACHE_MAX", "256")),
+                         max_bytes=1 << 20, ttl=SEARCH_CACHE_TTL_S)  # norm query -> (k, links)
 
 # ---------- tiny utils ----------
-def _tlog(tag: str, t0: float):
+def _tlog(tag: str, t0: float, extra: str = ""):
     if os.getenv("NOVA_TIMINGS", "0") == "1":
-        print(f"[web] {tag}={time.perf_counter()-t0:.2f}s", flush=True)
-
-def _http_get(url: str, timeout: int = WEB_TIMEOUT_S) -> bytes:
-    req = urllib.request.Request(
-        url,
-        headers={
-            "User-Agent": UA,
-            "Accept": "*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-        },
-    )
-    with urllib.request.urlopen(req, timeout=timeout) as r:
-        return r.read()
+        print(f"[web] {tag}={time.perf_counter()-t0:.2f}s{extra}", flush=True)
 
-def _clean_bytes(b: bytes, max_chars: int = 400_000) -> str:
+def _http_get_ex(url: str, timeout: float = WEB_TIMEOUT_S, headers: Optional[Dict[str, str]] = None):
     """
-    Light cleaner:
-      - unescape
-      - keep basic structure by turning <h1..h3> into newlines
-      - drop script/style/noscript
-      - strip the rest of tags
-      - collapse whitespace
+    GET returning (status, body, response headers); a 304 comes back as status, not an error.
+    Goes through core/net.py: per-host rate limit, circuit breaker (fails fast while a
+    host is down), latency stats.
     """
-    if not b:
-        return ""
-    s = b.decode("utf-8", "ignore")
-    s = html.unescape(s)
+    return NET.request(url, timeout=timeout, headers={
+        "User-Agent": UA,
+        "Accept": "*/*",
+        "Accept-Language": "en-US,en;q=0.9",
+        **(headers or {}),
+    })
 
-    # keep headings as line breaks (so sectioning survives stripping)
-    s = re.sub(r"(?is)<h[1-3][^>]*>", "\n", s)
-    s = re.sub(r"(?is)</h[1-3]>", "\n", s)
+def _http_get(url: str, timeout: float = WEB_TIMEOUT_S) -> bytes:
+    return _http_get_ex(url, timeout)[1]
 
-    # drop non-content blocks
-    s = re.sub(r"(?is)<script.*?</script>", " ", s)
-    s = re.sub(r"(?is)<style.*?</style>", " ", s)
-    s = re.sub(r"(?is)<noscript.*?</noscript>", " ", s)
+def _cached_get(url: str, transform, timeout: float = WEB_TIMEOUT_S, keep=None) -> str:
+    """
+    GET through the on-disk page cache (nova/cache/web.py), storing
+    transform(bytes, content_type=...) unless keep(result) says it is not worth it.
+    Fresh entries skip the network; stale ones are revalidated with ETag/Last-Modified;
+    if the network fails (or the new result is rejected) a stale entry is still better
+    than nothing.
+    """
+    ent = WCACHE.lookup(url)
+    if ent and ent.get("fresh"):
+        return ent.get("body") or ""
+    try:
+        status, b, hdrs = _http_get_ex(url, timeout, WCACHE.validators(ent))
+    except Exception:
+        if ent:
+            return ent.get("body") or ""
+        raise
+    if status == 304 and ent:
+        return WCACHE.revalidated(url, ent)
+    out = transform(b, content_type=hdrs.get("Content-Type"))
+    if keep is not None and not keep(out):
+        return (ent.get("body") or "") if ent else out
+    WCACHE.put(url, out, etag=hdrs.get("ETag"), last_modified=hdrs.get("Last-Modified"))
+    return out
+
+# ---------- charset + HTML → text ----------
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.I)
+_BOMS = ((b"\xef\xbb\xbf", "utf-8"), (b"\xff\xfe", "utf-16-le"), (b"\xfe\xff", "utf-16-be"))
+
+def detect_charset(b: bytes, content_type: Optional[str] = None) -> str:
+    """Charset from the Content-Type header, else a BOM, else <meta> in the first 4 KB; utf-8 by default."""
+    cands: List[str] = []
+    m = re.search(r"charset\s*=\s*[\"']?([A-Za-z0-9_.:-]+)", content_type or "", re.I)
+    if m:
+        cands.append(m.group(1))
+    for bom, enc in _BOMS:
+        if b.startswith(bom):
+            cands.append(enc)
+    m2 = _CHARSET_RE.search(b[:4096])
+    if m2:
+        cands.append(m2.group(1).decode("ascii", "ignore"))
+    for c in cands:
+        try:
+            return codecs.lookup(c).name
+        except LookupError:
+            continue
+    return "utf-8"
 
-    # remove all other tags
-    s = re.sub(r"(?is)<[^>]+>", " ", s)
+def _decode(b: bytes, content_type: Optional[str] = None) -> str:
+    return b.decode(detect_charset(b, content_type), "ignore")
 
-    # whitespace tidy
-    s = re.sub(r"[ \t\r\f\v]+", " ", s)
-    s = re.sub(r" +\n", "\n", s).strip()
-    return s[:max_chars]
+class _Budget(Exception):
+    pass
+
+class _TextExtractor(HTMLParser):
+    """
+    Streaming HTML → text, one line per block (p, li, td, headings, ...). Drops
+    script/style/noscript and link-dense blocks (menus, footers, tag clouds), turns
+    inline tags into a space, collapses whitespace, and stops (raises _Budget) once
+    `max_chars` of text have been produced.
+    """
+    _SKIP = {"script", "style", "noscript", "template"}
+    _BLOCK = {"address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+              "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+              "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+              "td", "th", "title", "tr", "ul"}
+
+    def __init__(self, max_chars: int, keep_links: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.keep_links = keep_links
+        self.out: List[str] = []
+        self.n = 0
+        self.skip = 0
+        self.anchor = 0
+        self.blk: List[str] = []
+        self.blk_n = 0
+        self.link_n = 0
+        self.dropped = 0
+
+    def flush(self) -> None:
+        t = "".join(self.blk).strip(" ")
+        dense = self.link_n > _LINK_DENSITY * len(t)
+        self.blk, self.blk_n, self.link_n = [], 0, 0
+        if not t:
+            return
+        if dense and not self.keep_links:
+            self.dropped += 1
+            return
+        self.out.append(t)
+        self.n += len(t) + 1
+        if self.n >= self.max_chars:
+            raise _Budget()
+
+    def _tag(self, tag: str) -> None:
+        if tag in self._BLOCK:
+            self.flush()
+        elif self.blk and not self.blk[-1].endswith(" "):
+            self.blk.append(" ")
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self.skip += 1
+        elif tag == "a":
+            self.anchor += 1
+        self._tag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self.skip:
+            self.skip -= 1
+        elif tag == "a" and self.anchor:
+            self.anchor -= 1
+        self._tag(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._tag(tag)
+
+    def handle_data(self, data):
+        if self.skip or not data:
+            return
+        t = _WS_RE.sub(" ", data)
+        if t[0] == " " and (not self.blk or self.blk[-1].endswith(" ")):
+            t = t[1:]
+        if not t:
+            return
+        self.blk.append(t)
+        self.blk_n += len(t)
+        if self.anchor:
+            self.link_n += len(t.strip(" "))
+        if self.n + self.blk_n >= self.max_chars:
+            self.flush()
+
+_WS_RE = re.compile(r"\s+")
+_LINK_DENSITY = 0.5  # share of a block's text inside <a> above which it counts as navigation
+_CHUNK = 64 * 1024
+
+def _clean_bytes(b: bytes, max_chars: int = WEB_PAGE_CHARS, content_type: Optional[str] = None,
+                 keep_links: bool = False) -> str:
+    """
+    Single-pass cleaner: bytes are decoded incrementally (charset from header/BOM/meta)
+    and fed to _TextExtractor chunk by chunk, so parsing stops as soon as `max_chars`
+    of text exist instead of after the whole page has been processed.
+    keep_links=True keeps link-dense blocks (e.g. to scrape URLs from result pages).
+    """
+    if not b:
+        return ""
+    dec = codecs.getincrementaldecoder(detect_charset(b, content_type))("ignore")
+    p = _TextExtractor(max_chars, keep_links)
+    try:
+        for i in range(0, len(b), _CHUNK):
+            p.feed(dec.decode(b[i:i + _CHUNK], final=i + _CHUNK >= len(b)))
+        p.close()
+        p.flush()
+    except _Budget:
+        pass
+    return "\n".join(p.out)[:max_chars]
 
 def _extract_title(text: str) -> str:
     m = re.search(r"(?im)^\s*(.+?)\s*$", (text or "").strip())
@@ -74,13 +228,86 @@ def _join_chars(chunks: List[str], max_chars: int) -> str:
     s = "\n\n".join(chunks)
     return s if len(s) <= max_chars else s[:max_chars]
 
+# ---------- passage ranking ----------
+_TERM_RE = re.compile(r"\d+(?:\.\d+)+|\w+")  # keeps versions like 12.6 as one term
+_STOP = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it me my of on or "
+    "the this that to was what when where which who why will with you".split())
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _TERM_RE.findall(text.lower()) if w not in _STOP]
+
+def _passages(text: str, size: int = WEB_PASSAGE_CHARS) -> List[str]:
+    """Consecutive lines (blocks) merged up to ~size chars; long blocks are cut at sentence ends."""
+    pieces: List[str] = []
+    for blk in (text or "").split("\n"):
+        blk = blk.strip()
+        if len(blk) <= size:
+            pieces.extend([blk] if blk else [])
+            continue
+        for sent in re.split(r"(?<=[.!?])\s+", blk):
+            pieces.extend(sent[i:i + size] for i in range(0, len(sent), size))
+    out: List[str] = []
+    for p in pieces:
+        if out and len(out[-1]) + len(p) + 1 <= size:
+            out[-1] += " " + p
+        else:
+            out.append(p)
+    return out
+
+def rank_passages(query: str, texts: Sequence[str], *, k1: float = 1.5, b: float = 0.75
+                  ) -> List[Tuple[float, int, int, str]]:
+    """
+    BM25 over the passages of all `texts` (the passages are the corpus).
+    Returns (score, text index, passage index, passage), best first.
+    """
+    items = [(i, j, p) for i, t in enumerate(texts) for j, p in enumerate(_passages(t))]
+    if not items:
+        return []
+    q = set(_terms(query))
+    toks = [_terms(p) for _, _, p in items]
+    avg = (sum(len(t) for t in toks) / len(toks)) or 1.0
+    df = Counter(w for t in toks for w in set(t) if w in q)
+    idf = {w: math.log(1 + (len(items) - n + 0.5) / (n + 0.5)) for w, n in df.items()}
+    out = []
+    for (i, j, p), t in zip(items, toks):
+        tf = Counter(w for w in t if w in idf)
+        norm = k1 * (1 - b + b * len(t) / avg)
+        out.append((sum(idf[w] * f * (k1 + 1) / (f + norm) for w, f in tf.items()), i, j, p))
+    out.sort(key=lambda x: (-x[0], x[2], x[1]))  # ties (e.g. no overlap): leading passages, round-robin
+    return out
+
+def _pack_passages(query: str, docs: Sequence[Tuple[str, ...]], max_chars: int) -> Dict[int, List[str]]:
+    """
+    Best passages that fit in max_chars (incl. a "[title] " prefix per doc), as
+    {doc index: passages in page order}. Without any term overlap, the leading
+    passages of each doc are used instead.
+    """
+    ranked = rank_passages(query, [d[2] or "" for d in docs])
+    if ranked and ranked[0][0] > 0:
+        ranked = [r for r in ranked if r[0] > 0]  # no filler once anything matches
+    picked: Dict[int, List[Tuple[int, str]]] = {}
+    used = 0
+    for _, i, j, p in ranked:
+        cost = len(p) + 1 + (0 if i in picked else len(docs[i][0] or "") + 5)
+        if used + cost > max_chars:
+            continue
+        picked.setdefault(i, []).append((j, p))
+        used += cost
+    return {i: [p for _, p in sorted(ps)] for i, ps in picked.items()}
+
 # ---------- search engines (DuckDuckGo only) ----------
+def ddg_url(base: str, query: str) -> str:
+    return f"{base}?q={urllib.parse.quote_plus(query)}"
+
+def serp_keep(parse):
+    """Cache check for a results page: a 200 with no links is a block/captcha page, not a SERP."""
+    return lambda body: bool(parse(body, 1))
+
 def ddg_html(query: str, k: int = WEB_MAXDOCS) -> List[Tuple[str, str]]:
-    base = "https://html.duckduckgo.com/html/"
-    q = urllib.parse.quote_plus(query)
-    url = f"{base}?q={q}"
-    b = _http_get(url)
-    s = b.decode("utf-8", "ignore")
+    return parse_ddg_html(_cached_get(ddg_url(DDG_HTML_URL, query), _decode, keep=serp_keep(parse_ddg_html)), k)
+
+def parse_ddg_html(s: str, k: int = WEB_MAXDOCS) -> List[Tuple[str, str]]:
     links: List[Tuple[str, str]] = []
     # parse anchors
     for m in re.finditer(r'(?is)<a[^>]+?href="([^"]+)"[^>]*>(.*?)</a>', s):
@@ -92,7 +319,7 @@ def ddg_html(query: str, k: int = WEB_MAXDOCS) -> List[Tuple[str, str]]:
                 break
     # fallback: plain URLs from cleaned text
     if not links:
-        cleaned = _clean_bytes(b)
+        cleaned = _clean_bytes(s.encode("utf-8"), keep_links=True)
         for m in re.finditer(r"(https?://[^\s\"']+)", cleaned):
             u = m.group(1)
             if "duckduckgo" in u:
@@ -103,11 +330,9 @@ def ddg_html(query: str, k: int = WEB_MAXDOCS) -> List[Tuple[str, str]]:
     return links[:k]
 
 def ddg_lite(query: str, k: int = WEB_MAXDOCS) -> List[Tuple[str, str]]:
-    base = "https://duckduckgo.com/lite/"
-    q = urllib.parse.quote_plus(query)
-    url = f"{base}?q={q}"
-    b = _http_get(url)
-    s = b.decode("utf-8", "ignore")
+    return parse_ddg_lite(_cached_get(ddg_url(DDG_LITE_URL, query), _decode, keep=serp_keep(parse_ddg_lite)), k)
+
+def parse_ddg_lite(s: str, k: int = WEB_MAXDOCS) -> List[Tuple[str, str]]:
     links: List[Tuple[str, str]] = []
     for m in re.finditer(r'(?is)<a[^>]+?href="([^"]+)"[^>]*>(.*?)</a>', s):
         href = html.unescape(m.group(1))
@@ -174,36 +399,76 @@ def _fastpath_links(q: str, k: int = WEB_MAXDOCS) -> List[Tuple[str,str]]:
     return []
 
 # ---------- fetch & synth ----------
-def fetch_and_clean(url: str) -> str:
+def fetch_and_clean(url: str, timeout: float = WEB_TIMEOUT_S) -> str:
     try:
-        return _clean_bytes(_http_get(url))
+        return _cached_get(url, _clean_bytes, timeout)
     except Exception:
         return ""
 
+def fetch_many(
+    links: Sequence[Tuple[str, str]], *, want: int = WEB_MAXDOCS, deadline_s: float = WEB_FETCH_DEADLINE_S
+) -> List[Tuple[str, str, str]]:
+    """
+    Fetch & clean candidate links concurrently under one overall deadline.
+    Stops as soon as `want` readable docs have landed; returns (title, url, text)
+    in the original search-rank order. Slow stragglers are abandoned, not awaited.
+    """
+    links = list(links)
+    if not links or want <= 0:
+        return []
+    per_req = max(1.0, min(float(WEB_TIMEOUT_S), deadline_s))
+    texts: Dict[int, str] = {}
+    ex = ThreadPoolExecutor(max_workers=max(1, min(WEB_FETCH_WORKERS, len(links))),
+                            thread_name_prefix="nova-fetch")
+    futs = {ex.submit(fetch_and_clean, url, per_req): i for i, (_, url) in enumerate(links)}
+    try:
+        for fut in as_completed(futs, timeout=deadline_s):
+            txt = fut.result()
+            if txt:
+                texts[futs[fut]] = txt
+                if len(texts) >= want:
+                    break
+    except _FutTimeout:
+        pass
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+    out: List[Tuple[str, str, str]] = []
+    for i in sorted(texts):
+        title, url = links[i]
+        out.append((title or _extract_title(texts[i]) or url, url, texts[i]))
+    return out
+
 # --- STRICT WEB SYNTH --- replace the whole function in nova/core/web_fetcher.py
 def synthesize_answer(
-    docs: List[Tuple[str, str]], query: str, *, budget_tokens: int = 800
+    docs: List[Tuple[str, ...]], query: str, *, budget_tokens: int = 800
 ) -> Tuple[str, Dict]:
     """Summarize using local model. Returns (text, meta).
+       `docs` are (title, url, text) from fetch_many; bare (title, url) pairs are fetched here.
        STRICT: refuses off-topic extracts; if query has a version (e.g. 12.6),
        require that version to appear in the combined extracts or return (no web results)."""
-    from .router import run_ollama_chat
+    from .router import run_ollama_chat, SchedulerBusy
 
     if not docs:
         return "", {"web_used": False, "links": []}
 
-    # Fetch small extracts per doc
+    docs = list(docs[:WEB_MAXDOCS])
+    urls = [d[1] for d in docs]
+    if any(len(d) < 3 for d in docs):
+        docs = fetch_many([(d[0], d[1]) for d in docs])
+
+    # Only the passages that best match the query, packed into the prompt budget
+    budget_chars = max(400, budget_tokens * 8)
+    picked = _pack_passages(query, docs, budget_chars)
     extracts: List[str] = []
     clean_docs: List[Tuple[str, str]] = []
-    for title, url in docs[:WEB_MAXDOCS]:
-        txt = fetch_and_clean(url)
-        if not txt:
+    for i, (title, url, txt) in enumerate(docs):
+        if not picked.get(i):
             continue
         clean_docs.append((title, url))
-        extracts.append(f"[{title}] {txt[:1200]}")
+        extracts.append(f"[{title}] " + " ".join(picked[i]))
 
     if not extracts:
-        return "", {"web_used": False, "links": [u for _, u in docs]}
+        return "", {"web_used": False, "links": urls}
 
     # Off-topic guard (weak keyword match must pass)
     if not _weak_match_guard(query, extracts):
@@ -218,7 +483,7 @@ def synthesize_answer(
             return "", {"web_used": False, "links": [u for _, u in clean_docs], "reason": "version_not_present"}
 
     cites = "\n".join(f"[{i+1}] {t} ({u})" for i, (t, u) in enumerate(clean_docs))
-    body = _join_chars(extracts, max(400, budget_tokens * 8))
+    body = _join_chars(extracts, budget_chars)
 
     prompt = (
         "You are a strict, concise researcher.\n"
@@ -226,11 +491,15 @@ def synthesize_answer(
         "Output: 3-6 short bullets with [#] citations. No fluff.\n\n"
         f"Question: {query}\n\nSources:\n{cites}\n\nExtracts:\n{body}\n"
     )
-    text, meta = run_ollama_chat(
-        [{"role": "user", "content": prompt}],
-        model=os.getenv("MODEL", "nous-hermes-13b-fast:latest"),
-        stream=(os.getenv("NOVA_STREAM", "0") == "1"),
-    )
+    try:
+        text, meta = run_ollama_chat(
+            [{"role": "user", "content": prompt}],
+            model=os.getenv("MODEL", "nous-hermes-13b-fast:latest"),
+            stream=(os.getenv("NOVA_STREAM", "0") == "1"),
+            priority="web",
+        )
+    except SchedulerBusy:
+        return "", {"web_used": False, "links": [u for _, u in clean_docs], "reason": "model_busy"}
     text = (text or "").strip()
 
     # If the model ignored instructions, force a clean fallback
@@ -245,8 +514,37 @@ def synthesize_answer(
     meta["web_used"] = True
     meta["links"] = [u for _, u in clean_docs]
     meta["route"] = "web"
+    meta["passages"] = sum(len(v) for v in picked.values())
+    meta["extract_chars"] = len(body)
     return text, meta
 
+# ---------- search-result cache ----------
+def normalize_query(query: str) -> str:
+    """Cache key for a search: case-folded terms minus stopwords, de-duplicated and sorted."""
+    words = _TERM_RE.findall((query or "").lower())
+    kept = [w for w in words if w not in _STOP] or words
+    return " ".join(sorted(set(kept)))
+
+def cached_search(query: str, k: int) -> Optional[List[Tuple[str, str]]]:
+    """Links from an earlier search for the same normalized query (at least k asked for), or None."""
+    # too few links for this k: a miss, and not refreshed in the LRU
+    ent = _SEARCH_CACHE.get(normalize_query(query), accept=lambda e: e[0] >= k or len(e[1]) >= k)
+    if ent is None:
+        return None
+    return list(ent[1][:k])
+
+def store_search(query: str, k: int, links: List[Tuple[str, str]]) -> None:
+    if links:  # empty = engines failed or blocked us; ask again next time
+        _SEARCH_CACHE.set(normalize_query(query), (k, list(links)),
+                          size=sum(len(t) + len(u) for t, u in links))
+
+def search_cache_stats() -> Dict:
+    return dict(_SEARCH_CACHE.stats(), ttl_s=SEARCH_CACHE_TTL_S)
+
+def _cache_note(hit: bool) -> str:
+    st = _SEARCH_CACHE.stats()
+    return f" cache={'hit' if hit else 'miss'} ({st['hits']}/{st['hits'] + st['misses']}, {st['hit_ratio']:.0%})"
+
 # ---------- internal search orchestration ----------
 def _engine_search(query: str, k: int = WEB_MAXDOCS) -> List[Tuple[str,str]]:
     # Try html, then lite (both DDG). We keep it simple & robust.
@@ -261,36 +559,43 @@ def _engine_search(query: str, k: int = WEB_MAXDOCS) -> List[Tuple[str,str]]:
             links.extend(ddg_lite(query, k=need))
         except Exception:
             pass
+    store_search(query, k, links[:k])
     return links[:k]
 
 # ---------- public API ----------
-def search_and_summarize(query: str, *, budget_tokens: int = 800) -> Tuple[str, Dict]:
+def search_and_summarize(query: str, *, budget_tokens: int = 800, stop=None) -> Tuple[str, Dict]:
+    """`stop` (a threading.Event): once set, synthesis is skipped so no model slot is taken."""
+    if WEB_ASYNC:
+        from . import web_async
+        return web_async.run(query, budget_tokens=budget_tokens, stop=stop)
     t0 = time.perf_counter()
 
     # 0) known-source fastpath (no engine hits)
     links_pairs = _fastpath_links(query, k=WEB_MAXDOCS)
+    note = ""
     if not links_pairs:
-        # 1) search (with DDG html→lite)
-        links_pairs = _engine_search(query, k=WEB_MAXDOCS)
-    _tlog("search", t0)
+        # 1) search (with DDG html→lite), unless the same normalized query was just searched
+        hit = cached_search(query, WEB_MAXDOCS)
+        links_pairs = hit if hit is not None else _engine_search(query, k=WEB_MAXDOCS)
+        note = _cache_note(hit is not None)
+    _tlog("search", t0, note)
 
-    # 2) fetch & clean → keep only readable docs
+    # 2) fetch & clean in parallel → keep only readable docs (text is handed to synthesis)
     f0 = time.perf_counter()
-    docs: List[Tuple[str, str]] = []
-    for title, url in links_pairs[:WEB_MAXDOCS]:
-        txt = fetch_and_clean(url)
-        if txt:
-            docs.append((title or _extract_title(txt) or url, url))
+    docs = fetch_many(links_pairs[:WEB_MAXDOCS], want=WEB_MAXDOCS)
     _tlog("fetch+clean", f0)
 
     if not docs:
         # Orchestrator will decide about fallbacks/retries
         return "", {"web_used": False, "links": links_pairs}
 
+    if stop is not None and stop.is_set():
+        return "", {"web_used": False, "links": [d[1] for d in docs], "reason": "cancelled"}
+
     # 3) synthesize
     ans, meta = synthesize_answer(docs, query, budget_tokens=budget_tokens)
     if (ans or '').strip() == '(no web results)':
-        return '', {'web_used': False, 'links': [u for _,u in docs], 'reason': 'no_useful_extracts'}
+        return '', {'web_used': False, 'links': [d[1] for d in docs], 'reason': 'no_useful_extracts'}
     return ans, meta
 
 def search_and_read(query: str, budget_tokens: int = 800, sites=None):
@@ -3,14 +3,17 @@ from __future__ import annotations
 from typing import Dict, List, Tuple
 from .orchestrator import answer as run_answer
 from .core.router import warm_model as warm_model
+from .core.convo import fit as _fit_history
 
 def run_chat(history: List[Dict], *, model: str, trace: bool=False) -> Tuple[str, Dict]:
-    # pick last user message
-    q=""
-    for m in reversed(history):
+    # pick last user message; the turns before it (bounded) go along as context
+    q=""; prior=[]
+    for i in range(len(history)-1, -1, -1):
+        m=history[i]
         if m.get("role")=="user":
             q=(m.get("content") or "").strip()
+            prior=history[:i]
             break
     if not q: return "…", {"route":"empty"}
-    t,m = run_answer(q, model=model, trace=trace)
+    t,m = run_answer(q, model=model, trace=trace, history=_fit_history(prior) or None)
     return t, m or {}
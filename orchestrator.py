@@ -1,16 +1,23 @@
 # nova/orchestrator.py
 from __future__ import annotations
 import os
+import threading
 import time
+import json
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as _FutTimeout
 from .cache import answers as ANSWERS
-from typing import Tuple, List, Dict, Optional
+from .cache import store as STORE
+from .cache import flight as FLIGHT
+from .cache import semantic as SEMANTIC
+from typing import Tuple, List, Dict, Optional, Iterator
 from .core.router import run_ollama_chat
 from .core import web_fetcher as WF
 from .core.style import _EMOJI_RE
-from .quality import AnswerQuality, ResponseMode, apply as quality_apply
+from .quality import AnswerQuality, ResponseMode, apply as quality_apply, is_passthrough
 from .core import prefs as PREFS
 from .core import router as ROUTER
 from .core import persona as PERSONA
+from .core import memory as MEMORY
 
 import re
 
@@ -58,26 +65,29 @@ def _load_style_defaults() -> dict:
 from .core.router import skill_first as _skill_router
 
 # ------------- web orchestrations ----------------
-def _web_try(query: str, budget: int = 800) -> Tuple[str, Dict]:
+def _web_try(query: str, budget: int = 800, stop: Optional[threading.Event] = None) -> Tuple[str, Dict]:
     t0 = time.perf_counter()
-    txt, meta = WF.search_and_summarize(query, budget_tokens=budget)
+    txt, meta = WF.search_and_summarize(query, budget_tokens=budget, stop=stop)
     if os.getenv("NOVA_TIMINGS","0")=="1":
         print(f"[timing] nova.orchestrator.web={time.perf_counter()-t0:.2f}s", flush=True)
     return txt, (meta or {})
 
-def _web_with_adaptive_retry(query: str, budget: int = 800) -> Tuple[str, Dict]:
+def _web_with_adaptive_retry(query: str, budget: int = 800,
+                             stop: Optional[threading.Event] = None) -> Tuple[str, Dict]:
     # 1st pass
-    txt, meta = _web_try(query, budget)
+    txt, meta = _web_try(query, budget, stop)
     links = (meta or {}).get("links") or []
     if txt and len(txt.strip())>0 and len(links)>0:
         return txt, meta
+    if stop is not None and stop.is_set():
+        return txt or "", meta or {}
 
     # retry once with a refined query (site: & add version-ish tokens)
     q2 = WF.adaptive_requery(query)
     if q2 and q2 != query:
         if os.getenv("NOVA_DIAG","0")=="1":
             print(f"[web] retry with: {q2}", flush=True)
-        txt2, meta2 = _web_try(q2, budget)
+        txt2, meta2 = _web_try(q2, budget, stop)
         links2 = (meta2 or {}).get("links") or []
         if txt2 and len(txt2.strip())>0 and len(links2)>0:
             return txt2, meta2
@@ -93,16 +103,97 @@ def _get_answers_module():
         return ANSW
     except Exception:
         return None
-# ------------- model run -------------------------
+# ------------- answer cache (read-through) -------
+# L1 = in-process cache/store, L2 = persistent cache/answers (SQLite). Keys cover the
+# normalized query, route, model, /style defaults and persona; web answers age out fast.
+CACHE_TTL_MODEL = int(os.getenv("NOVA_CACHE_TTL", "3600"))
+CACHE_TTL_WEB   = int(os.getenv("NOVA_CACHE_TTL_WEB", "600"))
 
-def _model_answer(q: str, model: Optional[str]) -> Tuple[str, Dict]:
-    # Base messages
-    sys_rules = PERSONA.compose_system_rules()
+def _cache_on() -> bool:
+    return os.getenv("NOVA_CACHE", "1").lower() in ("1", "true", "yes", "on")
+
+def _persona_hash() -> str:
     try:
-        import time
-        sys_rules = f"{sys_rules}\n\n(Current date/time: {time.strftime('%Y-%m-%d %H:%M %Z')})"
+        return PERSONA.state_hash()
+    except Exception:
+        return ""
+
+def _memory_gen(route: str) -> str:
+    # model answers may carry recalled memories, so /remember and /forget re-key them
+    try:
+        return MEMORY.generation() if route == "model" and MEMORY.RAG_ON else ""
+    except Exception:
+        return ""
+
+def _cache_intent(route: str, model: str) -> str:
+    return json.dumps({"route": route, "model": model, "style": _load_style_defaults(),
+                       "persona": _persona_hash(), "memory": _memory_gen(route)},
+                      sort_keys=True, default=str)
+
+def _cache_norm(q: str) -> str:
+    return " ".join((q or "").split()).lower()
+
+def _cache_lookup(route: str, q: str, model: str, ttl: int, intent: str) -> Optional[Tuple[str, Dict]]:
+    qn = _cache_norm(q)
+    hit = STORE.get(qn, {}, model, route == "web", False, extra=intent)
+    if hit:
+        return hit[0], dict(hit[1], cache="mem")
+    try:
+        txt, meta = ANSWERS.get(qn, intent=intent, ttl=ttl)
+    except Exception:
+        txt, meta = None, None
+    if txt:
+        STORE.set(qn, {}, model, route == "web", False, txt, meta or {}, extra=intent, ttl=ttl)
+        return txt, dict(meta or {}, cache="disk")
+    try:
+        return SEMANTIC.lookup(qn, route, intent, ttl)
+    except Exception:
+        return None
+
+def _cache_store(route: str, q: str, model: str, ttl: int, intent: str, txt: str, meta: Dict) -> None:
+    if not (txt or "").strip():
+        return
+    if route == "web" and not (meta or {}).get("links"):
+        return
+    qn = _cache_norm(q)
+    STORE.set(qn, {}, model, route == "web", False, txt, meta or {}, extra=intent, ttl=ttl)
+    try:
+        ANSWERS.put(qn, txt, meta or {}, intent=intent, ttl=ttl)
+        SEMANTIC.add(qn, route, intent, txt, meta or {})
     except Exception:
         pass
+
+def _read_through(route: str, q: str, model: str, ttl: int, compute) -> Tuple[str, Dict]:
+    """Serve (text, meta) from cache, or run compute() once even if identical questions race."""
+    if not _cache_on():
+        return compute()
+    intent = _cache_intent(route, model)
+    hit = _cache_lookup(route, q, model, ttl, intent)
+    if hit:
+        return hit
+
+    def _fill() -> Tuple[str, Dict]:
+        # a leader that finished between our lookup and FLIGHT.do has already stored it
+        again = _cache_lookup(route, q, model, ttl, intent)
+        if again:
+            return again
+        txt, meta = compute()
+        _cache_store(route, q, model, ttl, intent, txt, meta)
+        return txt, meta
+
+    (txt, meta), shared = FLIGHT.do(ANSWERS.key_for(_cache_norm(q), intent), _fill)
+    meta = dict(meta or {})
+    if shared:
+        meta["cache"] = "shared"
+    return txt, meta
+
+# ------------- model run -------------------------
+
+def _model_messages(q: str, history: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+    # Base messages
+    # The persona block stays the first message and byte-identical across calls so
+    # Ollama can reuse its prompt cache; anything per-question goes after it.
+    sys_rules = PERSONA.compose_system_rules()
     messages = [
       {"role": "system", "content": sys_rules},
       {"role": "user", "content": q},
@@ -153,15 +244,76 @@ def _model_answer(q: str, model: Optional[str]) -> Tuple[str, Dict]:
         # if quality module changes, skip the nudge silently
         pass
 
-    text, meta = run_ollama_chat(
-        messages,
-        model=model or os.getenv("MODEL", "nous-hermes-13b-fast:latest"),
-        stream=(os.getenv("NOVA_STREAM", "0") == "1"),
-    )
+    # conversation history sits right after the persona block: it only grows at the
+    # tail between turns, so the cached prefix keeps extending instead of resetting
+    if history:
+        messages[1:1] = [dict(m) for m in history]
+
+    # recalled memories (top-k by embedding, capped to a small token budget)
+    try:
+        mems = MEMORY.relevant(q)
+        if mems:
+            messages.insert(len(messages) - 1, {
+                "role": "system",
+                "content": "Things the user asked you to remember (use only if relevant):\n"
+                           + "\n".join(f"- {m}" for m in mems),
+            })
+    except Exception:
+        pass
+
+    try:
+        messages.insert(len(messages) - 1, {
+            "role": "system",
+            "content": f"(Current date/time: {time.strftime('%Y-%m-%d %H:%M %Z')})",
+        })
+    except Exception:
+        pass
+    return messages
+
+def _model_name(model: Optional[str]) -> str:
+    return model or os.getenv("MODEL", "nous-hermes-13b-fast:latest")
+
+class _Cancelled(RuntimeError):
+    """A speculative model call was called off before it finished."""
+
+def _model_answer(q: str, model: Optional[str],
+                  history: Optional[List[Dict[str, str]]] = None,
+                  stop: Optional[threading.Event] = None) -> Tuple[str, Dict]:
+    messages = _model_messages(q, history)
+    if stop is None:
+        text, meta = run_ollama_chat(
+            messages,
+            model=_model_name(model),
+            stream=(os.getenv("NOVA_STREAM", "0") == "1"),
+        )
+    else:
+        # streamed so `stop` is seen between chunks; closing the stream frees the slot
+        meta = {}
+        pieces: List[str] = []
+        gen = ROUTER.stream_ollama_chat(messages, model=_model_name(model), meta=meta,
+                                        priority="background", stop=stop)
+        try:
+            for piece in gen:
+                if stop.is_set():
+                    raise _Cancelled("speculative model answer dropped")
+                pieces.append(piece)
+        finally:
+            gen.close()
+        text = "".join(pieces).strip()
     meta = meta or {}
     meta.setdefault("route", "model")
+    p = PERSONA.compose()
+    meta.setdefault("persona", p.state)
+    meta.setdefault("persona_tokens", p.tokens)
     return text or "", meta
 
+def _cached_model_answer(q: str, model: Optional[str],
+                         history: Optional[List[Dict[str, str]]] = None) -> Tuple[str, Dict]:
+    if history:  # follow-ups depend on the conversation, so they bypass the answer cache
+        return _model_answer(q, model, history)
+    return _read_through("model", q, _model_name(model), CACHE_TTL_MODEL,
+                         lambda: _model_answer(q, model))
+
 # ------------- public API ------------------------
 def router_warm(model: str) -> Dict:
     # a cheap, one-token warmup that lets Ollama spin up
@@ -192,12 +344,92 @@ def _looks_recency_sensitive(q: str) -> bool:
 
 _GREETING_RE = re.compile(r"^(hi|hello|hey|hiya|yo|sup|howdy)[!. ]*$", re.I)
 
-def answer(q: str, model: Optional[str] = None, trace: bool = False) -> Tuple[str, Dict]:
-    if trace:
-        print("[orchestrator] enter answer()")
-
-    q_s = (q or "").strip()
-
+# ------------- speculative web + model ----------
+# With NOVA_WEB_SPECULATE=1 (default) the web path runs against a deadline, and when
+# its failure would fall back to the model, the model answer starts at the same time.
+# A web result that qualifies in time wins; otherwise the model answer (already under
+# way) is used. For a question that wanted the web, that answer carries a note that it
+# may be out of date instead of being replaced by the honesty message.
+# Each side gets a stop event: the loser stops at its next check (the model between
+# streamed chunks or while still queued, the web before its retry and before
+# synthesis), so it gives its model slot back instead of running to the end.
+# The speculative model call runs in the scheduler's background lane, so with a single
+# model slot web synthesis preempts it (sets its stop event); if the web then fails,
+# the model answer is asked for again in the interactive lane.
+WEB_SPECULATE = os.getenv("NOVA_WEB_SPECULATE", "1").lower() in ("1", "true", "yes", "on")
+WEB_DEADLINE_S = float(os.getenv("NOVA_WEB_DEADLINE", "25"))
+_SPEC_POOL = ThreadPoolExecutor(max_workers=int(os.getenv("NOVA_SPEC_WORKERS", "4")),
+                                thread_name_prefix="nova-spec")
+
+def _web_answer(q_s: str, stop: Optional[threading.Event] = None) -> Tuple[str, Dict]:
+    return _read_through("web", q_s, _model_name(None), CACHE_TTL_WEB,
+                         lambda: _web_with_adaptive_retry(q_s, budget=800, stop=stop))
+
+def _spec_model_answer(q_s: str, model: Optional[str],
+                       history: Optional[List[Dict[str, str]]],
+                       stop: threading.Event) -> Tuple[str, Dict]:
+    """
+    Model answer for the race: cache first, then a call that gives up once `stop` is
+    set. It stays out of single-flight so a cancelled run can't fail a caller waiting
+    on the same key; a finished answer is cached as usual.
+    """
+    name = _model_name(model)
+    intent = _cache_intent("model", name) if _cache_on() and not history else ""
+    hit = _cache_lookup("model", q_s, name, CACHE_TTL_MODEL, intent) if intent else None
+    if hit:
+        return hit
+    if stop.is_set():
+        raise _Cancelled("speculative model answer dropped")
+    txt, meta = _model_answer(q_s, model, history, stop)
+    if intent:
+        _cache_store("model", q_s, name, CACHE_TTL_MODEL, intent, txt, meta)
+    return txt, meta
+
+def _web_speculative(q_s: str, model: Optional[str],
+                     history: Optional[List[Dict[str, str]]]) -> Tuple[str, Dict, Dict]:
+    """Web answer under WEB_DEADLINE_S, plus the model future started alongside it (as ctx entries)."""
+    mdl_stop, web_stop = threading.Event(), threading.Event()
+    spec = {"model_future": _SPEC_POOL.submit(_spec_model_answer, q_s, model, history, mdl_stop),
+            "model_stop": mdl_stop}
+    web = _SPEC_POOL.submit(_web_answer, q_s, web_stop)
+    try:
+        txt, meta = web.result(timeout=WEB_DEADLINE_S)
+    except _FutTimeout:
+        web_stop.set()
+        txt, meta = "", {"web_used": False, "links": [], "reason": "deadline"}
+    except Exception:
+        _drop_model(spec)
+        raise
+    return txt, meta or {}, spec
+
+def _drop_model(ctx: Dict) -> None:
+    """Call off the speculative model answer, if one was started."""
+    if "model_stop" in ctx:
+        ctx["model_stop"].set()
+        ctx["model_future"].cancel()
+
+def _model_result(ctx: Dict, q_s: str, model: Optional[str],
+                  history: Optional[List[Dict[str, str]]]) -> Tuple[str, Dict]:
+    fut = ctx.get("model_future")
+    if fut is not None:
+        try:
+            txt, meta = fut.result()
+            return txt, dict(meta or {}, speculative="model")
+        except (_Cancelled, ROUTER.JobCancelled, ROUTER.SchedulerBusy):
+            # preempted by web synthesis or turned away by the background lane
+            txt, meta = _cached_model_answer(q_s, model, history)
+            return txt, dict(meta or {}, speculative="model")
+    txt, meta = _cached_model_answer(q_s, model, history)
+    return txt, dict(meta or {})
+
+def _answer_early(q_s: str, model: Optional[str] = None,
+                  history: Optional[List[Dict[str, str]]] = None) -> Tuple[Optional[Tuple[str, Dict]], Dict]:
+    """
+    Every route that runs before the model (code-only, greeting, skills, web, curated).
+    Returns (hit, ctx): `hit` is a finished (text, meta) or None; `ctx` carries the
+    web state the model stage needs for its honesty guard, plus the speculative
+    model future ("model_future") when one was started.
+    """
     # ---- code-only fast-path (no model) ----
     qs_low = (q_s or "").lower()
     if qs_low.startswith("code only:") or qs_low.startswith("code-only:") or " code only:" in qs_low:
@@ -206,13 +438,13 @@ def answer(q: str, model: Optional[str] = None, trace: bool = False) -> Tuple[st
         except Exception:
             payload = q_s
         fence = "```python\n" if any(k in payload for k in ("def ", "import ", "print(", "class ", "lambda ")) else "```\n"
-        return f"{fence}{payload}\n```", {"route": "code-only"}
+        return (f"{fence}{payload}\n```", {"route": "code-only"}), {}
 
     # 0) persona greeting intercept (not a skill)
     if _GREET_RE.fullmatch(q_s):
         g = PERSONA.get_greeting()
         if g:
-            return g, {"route": "persona-greeting"}
+            return (g, {"route": "persona-greeting"}), {}
 
     # 1) core skills (units, mathx, timex, weather, fxx, …)
     try:
@@ -220,7 +452,7 @@ def answer(q: str, model: Optional[str] = None, trace: bool = False) -> Tuple[st
     except Exception:
         skill_txt = None
     if skill_txt:
-        return _final_scrub(skill_txt), {"route": "skill"}
+        return (_final_scrub(skill_txt), {"route": "skill"}), {}
 
     # 2) web path if allowed & wanted (recency/price/etc.)
     env_web = (os.getenv("NOVA_WEB", "0").lower() in ("1", "true", "yes")) or _FW()
@@ -231,19 +463,27 @@ def answer(q: str, model: Optional[str] = None, trace: bool = False) -> Tuple[st
 
     web_txt = ""
     web_meta: Dict = {}
+    spec: Dict = {}
     if env_web and (wants_web or _FW()):
-        web_txt, web_meta = _web_with_adaptive_retry(q_s, budget=800)
+        if WEB_SPECULATE:
+            web_txt, web_meta, spec = _web_speculative(q_s, model, history)
+        else:
+            web_txt, web_meta = _web_answer(q_s)
         links = (web_meta or {}).get("links") or []
         if web_txt and web_txt.strip() and links:
+            _drop_model(spec)
             shaped = quality_apply(web_txt, q_s, _load_style_defaults())
-            return _final_scrub(shaped), {"route": "web", **web_meta}
+            won = {"speculative": "web"} if spec else {}
+            return (_final_scrub(shaped), {"route": "web", **web_meta, **won}), {}
         print("(no useful web signal: empty/blocked) → falling back to model", flush=True)
+    ctx = {"env_web": env_web, "wants_web": wants_web, "web_txt": web_txt, **spec}
 
     # 3) curated answers (A3) — pinned/local facts win
     try:
         curated = ANSW.maybe(q_s)
         if curated:
-            return curated, {"route": "answers"}
+            _drop_model(ctx)
+            return (curated, {"route": "answers"}), ctx
     except Exception:
         pass
 
@@ -258,15 +498,34 @@ def answer(q: str, model: Optional[str] = None, trace: bool = False) -> Tuple[st
                 q_line = q
             curated = ANSW.maybe(q_line)
             if curated:
-                return curated, {"route": "answers"}
+                _drop_model(ctx)
+                return (curated, {"route": "answers"}), ctx
         except Exception:
             pass
 
-    mdl_txt, mdl_meta = _model_answer(q_s, model)
+    return None, ctx
+
+def _web_missing(ctx: Dict) -> bool:
+    return bool(ctx.get("env_web") and ctx.get("wants_web") and not (ctx.get("web_txt") or "").strip())
+
+def _web_empty(ctx: Dict) -> bool:
+    # wanted the web, got nothing, and no speculative model answer was raced against it
+    return _web_missing(ctx) and "model_future" not in ctx
+
+_WEB_EMPTY_MSG = (
+    "(online info unavailable) — could not fetch reliable results right now. "
+    "Try again with /forceweb, or be more specific."
+)
+_WEB_LOST_NOTE = "(online info unavailable — answering from model knowledge, which may be out of date)\n\n"
+
+def _answer_finish(q_s: str, mdl_txt: str, ctx: Dict,
+                   mdl_meta: Optional[Dict] = None) -> Tuple[str, Dict]:
+    # model meta (timings, prefix reuse, persona, cache tier) travels with the answer
+    meta = dict(mdl_meta or {}, route="model")
 
     # 5) code-only guard: skip shaping if explicitly requested
     if "code only" in q_s.lower():
-        return mdl_txt, {"route": "model"}
+        return mdl_txt, meta
 
     # 6) quality shaping (respect /style defaults)
     try:
@@ -277,11 +536,80 @@ def answer(q: str, model: Optional[str] = None, trace: bool = False) -> Tuple[st
         pass
 
     # 7) Final honesty if we wanted web but it returned nothing
-    if env_web and wants_web and not (web_txt and web_txt.strip()):
-        return (
-            "(online info unavailable) — could not fetch reliable results right now. "
-            "Try again with /forceweb, or be more specific.",
-            {"route": "model", "note": "web-empty"},
-        )
+    if _web_empty(ctx):
+        return _WEB_EMPTY_MSG, {"route": "model", "note": "web-empty"}
+    if _web_missing(ctx):  # the speculative model answer stands in, flagged as such
+        meta["note"] = "web-empty"
+        mdl_txt = _WEB_LOST_NOTE + mdl_txt
+
+    return _final_scrub(mdl_txt), meta
 
-    return _final_scrub(mdl_txt), {"route": "model"}
+def answer(q: str, model: Optional[str] = None, trace: bool = False,
+           history: Optional[List[Dict[str, str]]] = None) -> Tuple[str, Dict]:
+    if trace:
+        print("[orchestrator] enter answer()")
+
+    q_s = (q or "").strip()
+    hit, ctx = _answer_early(q_s, model, history)
+    if hit:
+        return hit
+
+    # wanted the web and got nothing: the honesty message replaces any model answer
+    if _web_empty(ctx):
+        return _WEB_EMPTY_MSG, {"route": "model", "note": "web-empty"}
+
+    mdl_txt, mdl_meta = _model_result(ctx, q_s, model, history)
+    return _answer_finish(q_s, mdl_txt, ctx, mdl_meta)
+
+def answer_stream(q: str, model: Optional[str] = None, trace: bool = False,
+                  meta: Optional[Dict] = None,
+                  history: Optional[List[Dict[str, str]]] = None) -> Iterator[str]:
+    """
+    Generator variant of answer(): yields text pieces as they are produced.
+    Only an unshaped model answer streams token by token; skills, web, curated
+    answers and shaped formats (bullets/steps/caps) yield their finished text once.
+    The final meta is written into `meta` when given.
+    """
+    out = meta if meta is not None else {}
+    if trace:
+        print("[orchestrator] enter answer_stream()")
+
+    q_s = (q or "").strip()
+    hit, ctx = _answer_early(q_s, model, history)
+    if hit:
+        text, m = hit
+        out.update(m or {})
+        yield text
+        return
+
+    if _web_empty(ctx):
+        out.update({"route": "model", "note": "web-empty"})
+        yield _WEB_EMPTY_MSG
+        return
+
+    if "model_future" in ctx or "code only" in q_s.lower() or not is_passthrough(q_s, _load_style_defaults()):
+        mdl_txt, mdl_meta = _model_result(ctx, q_s, model, history)
+        text, m = _answer_finish(q_s, mdl_txt, ctx, mdl_meta)
+        out.update(m)
+        yield text
+        return
+
+    name = _model_name(model)
+    intent = _cache_intent("model", name) if _cache_on() and not history else ""
+    hit = _cache_lookup("model", q_s, name, CACHE_TTL_MODEL, intent) if intent else None
+    if hit:
+        out.update(hit[1])
+        out["route"] = "model"
+        yield _final_scrub(hit[0])
+        return
+
+    pieces: List[str] = []
+    for piece in ROUTER.stream_ollama_chat(_model_messages(q_s, history), model=name, meta=out):
+        pieces.append(piece)
+        yield piece
+    out["route"] = "model"
+    p = PERSONA.compose()
+    out.setdefault("persona", p.state)
+    out.setdefault("persona_tokens", p.tokens)
+    if intent:
+        _cache_store("model", q_s, name, CACHE_TTL_MODEL, intent, "".join(pieces).strip(), dict(out))
@@ -258,6 +258,23 @@ def apply(text: str, q_line: str, style_defaults: Optional[Dict] = None) -> str:
     return shaped
 
 
+def is_passthrough(q_line: str, style_defaults: Optional[Dict] = None) -> bool:
+    """True when apply() would hand the model text back untouched (safe to stream raw tokens)."""
+    mode = decide_response_mode(q_line, style_defaults)
+    if mode.get("format") not in ("plain", "mixed"):
+        return False
+    if mode.get("sentence_cap") or mode.get("max_words"):
+        return False
+    try:
+        from .core import prefs as PREFS
+        st = PREFS.load() or {}
+        if (st.get('style') or {}).get('leadins', False):
+            return False
+    except Exception:
+        pass
+    return True
+
+
 def _clamp_bullets(n: int, lo: int=2, hi: int=10) -> int:
     try: return max(lo, min(hi, int(n)))
     except: return 5
@@ -51,4 +51,54 @@ orch = importlib.import_module("nova.orchestrator")
 print(json.dumps({"_GREETING_RE_present": hasattr(orch, "_GREETING_RE")}))
 ok("orchestrator imports")
 
+# 7) async web transport reads close-delimited bodies past the stream buffer
+import asyncio
+web_async = importlib.import_module("nova.core.web_async")
+_big = b"x" * (300 * 1024)
+async def _serve_big():
+    async def h(r, w):
+        await r.readuntil(b"\r\n\r\n")
+        w.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nConnection: close\r\n\r\n" + _big)
+        await w.drain(); w.close()
+    srv = await asyncio.start_server(h, "127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+    async with srv:
+        return await web_async.stream_transport(f"http://127.0.0.1:{port}/", 5, {})
+_status, _body, _ = asyncio.run(_serve_big())
+if _status != 200 or len(_body) != len(_big):
+    no(f"close-delimited body truncated: got {len(_body)} of {len(_big)} bytes")
+ok("async transport reads close-delimited bodies to EOF")
+
+# 8) model meta (persona, cache tier) survives answer(); no real model call
+import tempfile, uuid
+from pathlib import Path
+_vec = importlib.import_module("nova.core.vectors")
+_sem = importlib.import_module("nova.cache.semantic")
+_ans = importlib.import_module("nova.cache.answers")
+# keep the fake answer out of the user's real ~/.cache answer store
+_ans_db = (_ans.DB_PATH, _ans._DB)
+_ans.DB_PATH, _ans._DB = Path(tempfile.mkdtemp(prefix="nova-sanity-")) / "answer_cache.sqlite3", None
+orch.run_ollama_chat = lambda msgs, **kw: ("Fake answer.", {"prompt_eval_count": 10})
+_q = f"sanity meta check {uuid.uuid4().hex[:8]} quicksort pivots"
+_, _m = orch.answer(_q)
+for k in ("persona", "persona_tokens"):
+    if k not in _m:
+        no(f"answer() meta lost {k!r}: {_m}")
+_, _m = orch.answer(_q)
+if _m.get("cache") != "mem" or "persona" not in _m:
+    no(f"cached answer() meta lost cache/persona: {_m}")
+if _vec.available():
+    _sem.SEM_ON = True
+    _sem._STORE = _vec.VectorStore(tempfile.mkdtemp(prefix="nova-sanity-") + "/sem")
+    _sem.set_embedder(lambda t: [1.0, 0.0, float("quicksort" in t)])
+    _sem.add(orch._cache_norm(_q + " x"), "model", orch._cache_intent("model", orch._model_name(None)),
+             "Fake answer.", dict(_m, cache=None))
+    _, _m = orch.answer(_q + " please")
+    if _m.get("cache") != "semantic":
+        no(f"semantic hit lost its cache tag: {_m}")
+with _ans._LOCK:
+    if _ans._DB is not None: _ans._DB.close()
+    _ans.DB_PATH, _ans._DB = _ans_db
+ok("answer() keeps persona + cache meta")
+
 print("All sanity checks passed.")
@@ -0,0 +1,308 @@
+# nova/server.py
+from __future__ import annotations
+import asyncio, json, os, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from . import orchestrator as ORCH
+from .core import router as ROUTER
+from .core import convo as CONVO
+from .core import keepwarm as KEEPWARM
+from .core import web_fetcher as WF
+from .core import net as NET
+from .core import style as STYLE
+from .cache import store as STORE
+from .cache import flight as FLIGHT
+from .cache import semantic as SEMANTIC
+from .cache import web as WCACHE
+from .logging import diag, log
+
+# Local HTTP/JSON front-end (stdlib asyncio): one warm process whose caches, keep-alive
+# pool and model warmth are shared by every client.
+#   POST /answer  {"q", "model"?, "history"?}         -> {"text", "meta"}
+#   POST /chat    {"messages"} | {"q", "session"?}     -> text/event-stream of {"delta"}, then event: done
+#   POST /warm    {"model"?}                          -> warm result
+#   GET  /metrics                                      -> server + cache + pool counters
+# Blocking orchestrator work runs on a bounded thread pool. When all workers are busy
+# and NOVA_SERVER_QUEUE more requests are waiting, new work gets 429.
+SERVER_HOST = os.getenv("NOVA_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("NOVA_SERVER_PORT", "8765"))
+SERVER_WORKERS = int(os.getenv("NOVA_SERVER_WORKERS", "4"))
+SERVER_QUEUE = int(os.getenv("NOVA_SERVER_QUEUE", "16"))
+SERVER_TIMEOUT_S = float(os.getenv("NOVA_SERVER_TIMEOUT", "120"))
+_MAX_BODY = 1 << 20
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error",
+            504: "Gateway Timeout"}
+
+class HTTPError(Exception):
+    def __init__(self, status: int, msg: str):
+        super().__init__(msg)
+        self.status = status
+
+def _default_model() -> str:
+    return ORCH._model_name(None)
+
+class NovaServer:
+    def __init__(self, *, workers: int = SERVER_WORKERS, queue: int = SERVER_QUEUE,
+                 timeout: float = SERVER_TIMEOUT_S):
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue)
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="nova-srv")
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self.started = time.time()
+        self.counts: Dict[str, int] = {"requests": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+        self.latency: Dict[str, List[float]] = {}  # path -> [n, total_ms, max_ms]
+
+    # ---- admission / accounting ----
+    def _admit(self) -> None:
+        with self._lock:
+            if self._admitted >= self.capacity:
+                self.counts["rejected"] += 1
+                raise HTTPError(429, "server busy, retry later")
+            self._admitted += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._admitted -= 1
+
+    def _count(self, k: str) -> None:
+        with self._lock:
+            self.counts[k] += 1
+
+    def _observe(self, path: str, ms: float) -> None:
+        path = path if path in ("/answer", "/chat", "/warm", "/metrics") else "other"
+        with self._lock:
+            s = self.latency.setdefault(path, [0, 0.0, 0.0])
+            s[0] += 1; s[1] += ms; s[2] = max(s[2], ms)
+
+    async def _run(self, fn, *args):
+        """Run blocking fn on the worker pool under admission control and the request timeout."""
+        self._admit()
+        fut = asyncio.get_running_loop().run_in_executor(self._pool, self._guarded, fn, args)
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), self.timeout)
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            raise HTTPError(504, f"timed out after {self.timeout:.0f}s")
+
+    def _guarded(self, fn, args):
+        # the slot is held until the work really finishes, even if the client timed out
+        try:
+            return fn(*args)
+        finally:
+            self._release()
+
+    # ---- handlers ----
+    async def h_answer(self, body: Dict) -> Dict:
+        q = (body.get("q") or "").strip()
+        if not q:
+            raise HTTPError(400, "missing 'q'")
+        hist = CONVO.fit(body.get("history") or []) or None
+        text, meta = await self._run(ORCH.answer, q, body.get("model"), False, hist)
+        return {"text": text, "meta": meta or {}}
+
+    def _chat_args(self, body: Dict) -> Tuple[str, Optional[List[Dict]], Optional[CONVO.Conversation]]:
+        sid = body.get("session")
+        if body.get("messages"):
+            msgs = body["messages"]
+            for i in range(len(msgs) - 1, -1, -1):
+                if msgs[i].get("role") == "user":
+                    return (msgs[i].get("content") or "").strip(), CONVO.fit(msgs[:i]) or None, None
+            return "", None, None
+        conv = CONVO.session(str(sid)) if sid else None
+        return (body.get("q") or "").strip(), (conv.messages() if conv else None), conv
+
+    async def h_chat(self, body: Dict, writer: asyncio.StreamWriter) -> None:
+        q, hist, conv = self._chat_args(body)
+        if not q:
+            raise HTTPError(400, "missing user message")
+        self._admit()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancel = threading.Event()
+        meta: Dict = {}
+
+        def work():
+            pieces: List[str] = []
+            style = {"no_emoji": ORCH._NE()}  # /noemoji, as in chat_loop._stream
+            try:
+                for piece in ORCH.answer_stream(q, body.get("model"), False, meta, hist):
+                    if cancel.is_set():
+                        return
+                    piece = STYLE.scrub_emoji_live(piece, style)
+                    if not piece:
+                        continue
+                    pieces.append(piece)
+                    loop.call_soon_threadsafe(queue.put_nowait, ("delta", piece))
+                if conv is not None:
+                    conv.add(q, "".join(pieces))
+                loop.call_soon_threadsafe(queue.put_nowait, ("done", None))
+            except BaseException as e:
+                loop.call_soon_threadsafe(queue.put_nowait, ("error", repr(e)))
+            finally:
+                self._release()
+
+        self._pool.submit(work)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        deadline = loop.time() + self.timeout
+        try:
+            while True:
+                try:
+                    kind, data = await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    self._count("timeouts")
+                    writer.write(_sse("error", {"error": "timeout"}))
+                    break
+                if kind == "delta":
+                    writer.write(_sse(None, {"delta": data}))
+                elif kind == "done":
+                    writer.write(_sse("done", {"meta": meta}))
+                    break
+                else:
+                    self._count("errors")
+                    writer.write(_sse("error", {"error": data}))
+                    break
+                await writer.drain()
+            await writer.drain()
+        finally:
+            cancel.set()
+
+    async def h_warm(self, body: Dict) -> Dict:
+        return await self._run(KEEPWARM.warm, body.get("model") or _default_model())
+
+    def h_metrics(self) -> Dict:
+        with self._lock:
+            lat = {p: {"n": n, "avg_ms": round(tot / n, 1) if n else 0.0, "max_ms": round(mx, 1)}
+                   for p, (n, tot, mx) in self.latency.items()}
+            srv = dict(self.counts, inflight=self._admitted, workers=self.workers,
+                       capacity=self.capacity, uptime_s=int(time.time() - self.started))
+        out = {"server": srv, "latency": lat}
+        for name, fn in (("pool", ROUTER.pool_stats), ("scheduler", ROUTER.scheduler_stats),
+                         ("skills", ROUTER.skill_stats),
+                         ("keepwarm", KEEPWARM.stats), ("answer_cache", STORE.stats), ("flight", FLIGHT.stats),
+                         ("semantic", SEMANTIC.stats), ("web_cache", WCACHE.stats),
+                         ("search_cache", WF.search_cache_stats), ("net", NET.stats)):
+            try:
+                out[name] = fn()
+            except Exception as e:
+                out[name] = {"error": repr(e)}
+        return out
+
+    # ---- HTTP plumbing ----
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                req = await _read_request(reader)
+                if req is None:
+                    break
+                method, path, headers, raw = req
+                keep = headers.get("connection", "").lower() != "close"
+                t0 = time.perf_counter()
+                self._count("requests")
+                try:
+                    body = json.loads(raw or b"{}") if raw else {}
+                    if not isinstance(body, dict):
+                        raise HTTPError(400, "JSON object expected")
+                    if path == "/chat":
+                        if method != "POST":
+                            raise HTTPError(405, "use POST")
+                        await self.h_chat(body, writer)
+                        self._observe(path, (time.perf_counter() - t0) * 1000)
+                        break  # event streams end the connection
+                    if path == "/answer" and method == "POST":
+                        status, out = 200, await self.h_answer(body)
+                    elif path == "/warm" and method in ("GET", "POST"):
+                        status, out = 200, await self.h_warm(body)
+                    elif path == "/metrics" and method == "GET":
+                        status, out = 200, self.h_metrics()
+                    elif path in ("/answer", "/warm", "/metrics"):
+                        raise HTTPError(405, "method not allowed")
+                    else:
+                        raise HTTPError(404, "not found")
+                except HTTPError as e:
+                    status, out = e.status, {"error": str(e)}
+                except json.JSONDecodeError:
+                    status, out = 400, {"error": "invalid JSON"}
+                except Exception as e:
+                    self._count("errors")
+                    diag(f"[server] {path} failed: {e!r}")
+                    status, out = 500, {"error": repr(e)}
+                _write_json(writer, status, out, keep)
+                await writer.drain()
+                self._observe(path, (time.perf_counter() - t0) * 1000)
+                if not keep:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HTTPError as e:
+            _write_json(writer, e.status, {"error": str(e)}, False)
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def serve(self, host: str = SERVER_HOST, port: int = SERVER_PORT) -> None:
+        KEEPWARM.start([_default_model()])
+        srv = await asyncio.start_server(self.handle, host, port)
+        log(f"[server] listening on http://{host}:{port} workers={self.workers} capacity={self.capacity}")
+        async with srv:
+            await srv.serve_forever()
+
+def _sse(event: Optional[str], data: Dict) -> bytes:
+    head = f"event: {event}\n" if event else ""
+    return (head + "data: " + json.dumps(data, ensure_ascii=False) + "\n\n").encode("utf-8")
+
+def _write_json(writer: asyncio.StreamWriter, status: int, obj: Dict, keep: bool) -> None:
+    data = json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep else 'close'}\r\n")
+    if status == 429:
+        head += "Retry-After: 1\r\n"
+    writer.write((head + "\r\n").encode("latin-1") + data)
+
+async def _read_request(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "bad request line")
+    headers: Dict[str, str] = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+    try:
+        n = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "bad content-length")
+    if n < 0:
+        raise HTTPError(400, "bad content-length")
+    if n > _MAX_BODY:
+        raise HTTPError(413, "body too large")
+    raw = await reader.readexactly(n) if n else b""
+    return method.upper(), target.split("?", 1)[0], headers, raw
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = list(sys.argv[1:] if argv is None else argv)
+    host, port = SERVER_HOST, SERVER_PORT
+    if args:
+        host, _, p = args[0].rpartition(":") if ":" in args[0] else (host, "", args[0])
+        port = int(p)
+    try:
+        asyncio.run(NovaServer().serve(host or SERVER_HOST, port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
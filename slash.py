@@ -11,6 +11,7 @@ from .core import prefs as PREFS
 # Persona + memory layers (create persona.py and memory.py in nova/core if you haven't yet)
 from .core import persona as PERSONA
 from .core import memory as MEMORY
+from .core import convo as CONVO
 
 
 # ---------- helpers ----------
@@ -164,6 +165,24 @@ def cmd_forget(args: str) -> str:
     return _json({"removed": removed})
 
 
+# ---------- /convo ----------
+def cmd_convo(args: str) -> str:
+    a = (args or "").strip().lower()
+    if a in ("", "show"):
+        return _json({"convo": CONVO.enabled(), **CONVO.session().stats(),
+                      "summary": CONVO.session().summary})
+    if a == "clear":
+        CONVO.session().clear()
+        return _json({"convo": CONVO.enabled(), "cleared": True})
+    on = _bool_word(a)
+    if on is None:
+        return 'usage: /convo on|off|show|clear'
+    CONVO.set_enabled(on)
+    if not on:
+        CONVO.session().clear()
+    return _json({"convo": on})
+
+
 # ---------- dispatcher ----------
 def try_handle(line: str) -> Optional[str]:
     """
@@ -199,6 +218,10 @@ def try_handle(line: str) -> Optional[str]:
         args = (s.split(" ", 1)[1:] or ["show"])[0].strip()
         return cmd_greeting(args)
 
+    if s.startswith("/convo"):
+        args = (s.split(" ", 1)[1:] or ["show"])[0].strip()
+        return cmd_convo(args)
+
     if s.startswith("/remember"):
         args = (s.split(" ", 1)[1:] or [""])[0]
         return cmd_remember(args)